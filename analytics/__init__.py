@@ -0,0 +1,30 @@
+"""Headless data layer behind the Music Money dashboard.
+
+Nothing in this package imports Streamlit, so every stage can be reused
+from batch jobs, benchmarks and tests.
+"""
+
+from analytics.aggregates import apply_assumptions, artist_base_stats, video_outcomes
+from analytics.anomalies import AnomalyDetector
+from analytics.filters import ExclusionFilter, load_exclusion_filter
+from analytics.forecast import fit_decay, forecast_views, with_forecasts
+from analytics.growth import GrowthIndex
+from analytics.ingest import content_key, load_datasets
+from analytics.matching import ArtistMatcher, match_coverage
+from analytics.metrics import (
+    asset_gap, deal_projection, ghost_income, lottery, monthly_salary,
+    release_heatmap, revenue_split, select_primary, top_artists,
+)
+from analytics.simulation import simulate_deal, simulate_deals
+from analytics.store import SnapshotStore
+from analytics.sweep import artist_break_even, sensitivity_sweep
+
+__all__ = [
+    "AnomalyDetector", "ArtistMatcher", "ExclusionFilter", "GrowthIndex", "SnapshotStore",
+    "apply_assumptions", "artist_base_stats", "artist_break_even", "asset_gap",
+    "content_key", "deal_projection", "fit_decay", "forecast_views",
+    "ghost_income", "load_datasets", "load_exclusion_filter", "lottery",
+    "match_coverage", "monthly_salary", "release_heatmap", "revenue_split",
+    "select_primary", "sensitivity_sweep", "simulate_deal", "simulate_deals",
+    "top_artists", "video_outcomes", "with_forecasts",
+]
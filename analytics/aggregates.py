@@ -0,0 +1,40 @@
+"""Per-artist aggregates that do not depend on the sidebar assumptions.
+
+Every money column in the Asset Gap is linear in RPM, flat fee or production
+cost, so only view and video totals need a groupby. The financial columns
+are then a handful of scalar-times-array operations per slider move.
+"""
+
+import numpy as np
+import pandas as pd
+
+LOST_LABEL = 'Artist Lost Money (Hit Song)'
+WON_LABEL = 'Artist Won (Safe)'
+
+
+def artist_base_stats(df):
+    """Total ``View Count`` and video count (``Video Title``) per ``Clean_Artist_Name``."""
+    return df.groupby('Clean_Artist_Name', observed=True).agg({
+        'View Count': 'sum', 'Video Title': 'count'
+    }).reset_index()
+
+
+def apply_assumptions(base, rpm, flat_fee, prod_cost):
+    """Derive the Asset Gap money columns from :func:`artist_base_stats` output."""
+    views = base['View Count'].to_numpy(dtype='float64', na_value=0.0)
+    videos = base['Video Title'].to_numpy(dtype='float64')
+
+    artist_stats = base.copy()
+    artist_stats['Actual_Revenue'] = views * (rpm / 1000)
+    artist_stats['Est_Fees_Received'] = videos * flat_fee
+    artist_stats['Total_Prod_Cost'] = videos * prod_cost
+    artist_stats['Net_Independent_Profit'] = artist_stats['Actual_Revenue'] - artist_stats['Total_Prod_Cost']
+    artist_stats['Wealth_Gap'] = artist_stats['Net_Independent_Profit'] - artist_stats['Est_Fees_Received']
+    return artist_stats
+
+
+def video_outcomes(views, rpm, flat_fee):
+    """Per-video revenue and Lottery outcome label for the given assumptions."""
+    revenue = pd.Series(views, copy=False).astype('float64') / 1000 * rpm
+    outcome = np.where(revenue.to_numpy() > flat_fee, LOST_LABEL, WON_LABEL)
+    return revenue, pd.Series(outcome, index=revenue.index)
@@ -0,0 +1,102 @@
+"""Streaming outlier flags for snapshot-to-snapshot view gains.
+
+An :class:`AnomalyDetector` keeps an exponentially weighted mean and
+variance of the daily gain for every key (a video or an artist). Each new
+snapshot is scored against those running statistics and then folded into
+them, so memory stays at three numbers per key however many weeks are fed
+in, and a new weekly log only costs one pass over its own rows.
+
+Gains are labelled:
+
+* ``negative`` - the view count went down (deleted videos, scrape glitches);
+* ``spike`` - more than ``threshold`` spreads above the key's running mean
+  once it has ``warmup`` observations;
+* ``drop`` - a gain that collapsed or stalled: below ``DROP_RATIO`` of the
+  running mean and more than ``threshold`` standard deviations under it.
+
+Flagged gains are not folded into the statistics, so one bot burst does not
+raise the baseline for the following weeks.
+"""
+
+import numpy as np
+import pandas as pd
+
+ANOMALY_KINDS = ['spike', 'drop', 'negative']
+
+# Weight of the newest gain in the running mean and variance.
+ALPHA = 0.3
+Z_THRESHOLD = 4.0
+WARMUP = 3
+# A spike must also be this many times the running mean (and a drop this
+# fraction of it), so steady low-variance videos are not flagged for noise.
+SPIKE_RATIO = 2.0
+DROP_RATIO = 0.25
+# The upper spread is never taken below this fraction of the running mean,
+# since a few weeks of history underestimate it. The lower tail only gets
+# the 1 view/day floor: gains are never negative once learned, so a relative
+# floor would push every drop below zero, where ``negative`` takes over.
+MIN_RELATIVE_SPREAD = 0.25
+
+
+class AnomalyDetector:
+    """Running per-key statistics of daily gains, updated one snapshot at a time."""
+
+    def __init__(self, alpha=ALPHA, threshold=Z_THRESHOLD, warmup=WARMUP):
+        self.alpha = alpha
+        self.threshold = threshold
+        self.warmup = warmup
+        # Statistics live in arrays aligned with ``_keys``; the index keeps its
+        # hash table between updates, so each snapshot costs one lookup.
+        self._keys = None
+        self._mean = np.empty(0)
+        self._var = np.empty(0)
+        self._count = np.empty(0, dtype=np.int64)
+
+    def __len__(self):
+        return 0 if self._keys is None else len(self._keys)
+
+    def update(self, gains, days=1.0):
+        """Score ``gains`` (a Series indexed by key) over a ``days`` interval and learn from them.
+
+        Returns a categorical Series of :data:`ANOMALY_KINDS` aligned with
+        ``gains``; unflagged and missing gains are ``NaN``.
+        """
+        if not gains.index.is_unique:
+            gains = gains[~gains.index.duplicated()]
+        x = gains.to_numpy(dtype='float64', na_value=np.nan) / max(float(days), 1e-9)
+        if self._keys is None:
+            self._keys = gains.index[:0]
+        pos = self._keys.get_indexer(gains.index)
+        new = pos < 0
+        if new.any():
+            n_new = int(new.sum())
+            pos[new] = len(self._keys) + np.arange(n_new)
+            self._keys = self._keys.append(gains.index[new])
+            self._mean = np.concatenate([self._mean, np.full(n_new, np.nan)])
+            self._var = np.concatenate([self._var, np.full(n_new, np.nan)])
+            self._count = np.concatenate([self._count, np.zeros(n_new, dtype=np.int64)])
+        mean, var, count = self._mean[pos], self._var[pos], self._count[pos]
+
+        seen = count >= self.warmup
+        deviation = np.maximum(np.sqrt(np.nan_to_num(var)), 1.0)
+        spread = np.maximum(deviation, MIN_RELATIVE_SPREAD * np.abs(np.nan_to_num(mean)))
+        with np.errstate(invalid='ignore'):
+            spike = seen & ((x - mean) / spread > self.threshold) & (x > SPIKE_RATIO * mean)
+            drop = seen & ((mean - x) / deviation > self.threshold) & (x < DROP_RATIO * mean)
+        negative = x < 0
+
+        codes = np.full(len(x), -1, dtype=np.int8)
+        # Codes follow ANOMALY_KINDS; a negative gain overrides a drop.
+        for code, hit in enumerate((spike, drop, negative)):
+            codes[hit] = code
+        flagged = codes >= 0
+
+        learn = ~flagged & ~np.isnan(x)
+        pos, x, mean, var, count = pos[learn], x[learn], mean[learn], var[learn], count[learn]
+        first = count == 0
+        delta = np.where(first, 0.0, x - np.nan_to_num(mean))
+        self._mean[pos] = np.where(first, x, np.nan_to_num(mean) + self.alpha * delta)
+        self._var[pos] = np.where(first, 0.0, (1 - self.alpha) * (np.nan_to_num(var) + self.alpha * delta * delta))
+        self._count[pos] = count + 1
+
+        return pd.Series(pd.Categorical.from_codes(codes, categories=ANOMALY_KINDS), index=gains.index)
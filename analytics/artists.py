@@ -0,0 +1,92 @@
+"""Shared integer encoding of ``Clean_Artist_Name`` across frames.
+
+:class:`ArtistDictionary` assigns one code per artist name, shared by the
+Detailed Analytics frame and the History Log. :meth:`ArtistDictionary.group`
+sorts a frame by that code and records where each artist's rows start and
+end, so selecting artists becomes a few positional slices instead of a
+string comparison over every row.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class ArtistDictionary:
+    """Sorted artist names and their integer codes."""
+
+    def __init__(self, names):
+        self.names = pd.Index(sorted(set(names)), dtype=object)
+        self.dtype = pd.CategoricalDtype(self.names)
+
+    @classmethod
+    def from_frames(cls, *frames):
+        names = set()
+        for frame in frames:
+            if 'Clean_Artist_Name' in frame.columns:
+                names.update(frame['Clean_Artist_Name'].dropna().astype(str).unique())
+        return cls(names)
+
+    def codes(self, artists):
+        """Codes of the known names in ``artists``; unknown names are dropped."""
+        codes = self.names.get_indexer(list(artists))
+        return codes[codes >= 0]
+
+    def encode(self, values):
+        values = pd.Series(values)
+        return values.astype(str).where(values.notna()).astype(self.dtype)
+
+    def group(self, frame):
+        return ArtistGroups(self, frame)
+
+
+class ArtistGroups:
+    """A frame sorted by artist code with a code -> row range index.
+
+    Rows without an artist (code -1) are kept at the end of the frame.
+    """
+
+    def __init__(self, dictionary, frame):
+        self.dictionary = dictionary
+        if 'Clean_Artist_Name' not in frame.columns or frame.empty:
+            self.frame = frame
+            self.offsets = np.zeros(len(dictionary.names) + 1, dtype=np.int64)
+            return
+
+        frame = frame.copy()
+        frame['Clean_Artist_Name'] = dictionary.encode(frame['Clean_Artist_Name'].to_numpy())
+        codes = frame['Clean_Artist_Name'].cat.codes.to_numpy()
+        # Sort missing artists (-1) last while keeping the original order within each artist.
+        order = np.argsort(np.where(codes < 0, len(dictionary.names), codes), kind='stable')
+        self.frame = frame.iloc[order]
+        counts = np.bincount(codes[codes >= 0], minlength=len(dictionary.names))
+        self.offsets = np.concatenate([[0], np.cumsum(counts)])
+
+    def present_names(self):
+        """Artists with at least one row, in dictionary order."""
+        return list(self.dictionary.names[np.diff(self.offsets) > 0])
+
+    def _take(self, codes):
+        codes = np.sort(codes)
+        starts = self.offsets[codes]
+        lengths = self.offsets[codes + 1] - starts
+        # Expand the [start, start + length) ranges into row positions without a Python loop.
+        run_starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+        positions = np.arange(lengths.sum()) + np.repeat(starts - run_starts, lengths)
+        return self.frame.iloc[positions]
+
+    def artist(self, name):
+        codes = self.dictionary.codes([name])
+        if len(codes) == 0:
+            return self.frame.iloc[0:0]
+        code = codes[0]
+        return self.frame.iloc[self.offsets[code]:self.offsets[code + 1]]
+
+    def select(self, artists):
+        return self._take(self.dictionary.codes(artists))
+
+    def exclude(self, artists):
+        keep = np.ones(len(self.dictionary.names), dtype=bool)
+        keep[self.dictionary.codes(artists)] = False
+        selected = self._take(np.flatnonzero(keep))
+        unassigned = self.frame.iloc[self.offsets[-1]:]
+        return pd.concat([selected, unassigned]) if len(unassigned) else selected
@@ -0,0 +1,86 @@
+"""Bound the size of chart payloads before they are handed to Plotly.
+
+* :func:`decimate_scatter` keeps at most ``max_points`` rows of a scatter
+  using Largest-Triangle-Three-Buckets (LTTB), which preserves peaks and
+  troughs that uniform sampling would drop.
+* :func:`top_k_series` keeps the ``k`` largest series of a line chart and
+  folds the rest into a single "Other" series.
+"""
+
+import numpy as np
+import pandas as pd
+
+MAX_SCATTER_POINTS = 4000
+# Above this many points, scatters switch to WebGL rendering.
+WEBGL_THRESHOLD = 1000
+TOP_K_SERIES = 10
+OTHER_LABEL = 'Other'
+
+
+def _as_float(values):
+    values = pd.Series(values)
+    if pd.api.types.is_datetime64_any_dtype(values):
+        values = values.astype('int64')
+    return values.to_numpy(dtype='float64', na_value=np.nan)
+
+
+def lttb_indices(x, y, n_out):
+    """Positions of the ``n_out`` points LTTB keeps from ``x``/``y`` sorted by ``x``."""
+    n = len(x)
+    if n_out >= n:
+        return np.arange(n)
+    if n_out < 3:
+        return np.array([0, n - 1][:max(n_out, 0)], dtype=np.int64)
+
+    x = _as_float(x)
+    y = _as_float(y)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], max(edges[i + 1], edges[i] + 1)
+        if i + 2 < len(edges):
+            nxt = slice(edges[i + 1], max(edges[i + 2], edges[i + 1] + 1))
+            avg_x, avg_y = np.nanmean(x[nxt]), np.nanmean(y[nxt])
+        else:
+            avg_x, avg_y = x[-1], y[-1]
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + (int(np.nanargmax(area)) if not np.isnan(area).all() else 0)
+        keep[i + 1] = a
+    return np.unique(keep)
+
+
+def decimate_scatter(df, x, y, max_points=MAX_SCATTER_POINTS, group=None):
+    """Return at most ``max_points`` rows of ``df`` that keep the shape of ``y`` over ``x``.
+
+    With ``group`` (e.g. the color column), each group gets a share of the
+    budget proportional to its size, so small groups stay visible.
+    """
+    if len(df) <= max_points:
+        return df
+    df = df.dropna(subset=[x, y]).sort_values(x, kind='stable')
+    if group is None:
+        return df.iloc[lttb_indices(df[x], df[y], max_points)]
+
+    parts = []
+    sizes = df.groupby(group, observed=True).size()
+    for name, part in df.groupby(group, observed=True):
+        budget = max(3, int(max_points * sizes[name] / len(df)))
+        parts.append(part.iloc[lttb_indices(part[x], part[y], budget)])
+    return pd.concat(parts).sort_values(x, kind='stable')
+
+
+def top_k_series(df, series, x, y, k=TOP_K_SERIES, other_label=OTHER_LABEL):
+    """Keep the ``k`` series with the largest total ``y``; sum the rest per ``x`` as ``other_label``."""
+    totals = df.groupby(series, observed=True)[y].sum()
+    if len(totals) <= k:
+        return df
+    top = totals.nlargest(k).index
+    is_top = df[series].isin(top)
+    other = df[~is_top].groupby(x, as_index=False)[y].sum()
+    other[series] = other_label
+    kept = df.loc[is_top, [x, series, y]].copy()
+    kept[series] = kept[series].astype(object)
+    return pd.concat([kept, other[[x, series, y]]], ignore_index=True)
@@ -0,0 +1,90 @@
+"""Channel and keyword exclusion rules for the History Log.
+
+The rules are compiled once into an :class:`ExclusionFilter` and evaluated
+on the *distinct* titles/channels of a frame, so a title that appears in
+every weekly snapshot is only tested once.
+
+The default lists below can be replaced by a JSON file of the form::
+
+    {"keywords": ["ethiopian", "..."], "drop_channels": ["EBS TV", "..."]}
+
+passed to :func:`load_exclusion_filter` or pointed at by the
+``MMA_EXCLUSIONS_FILE`` environment variable.
+"""
+
+import hashlib
+import json
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+# --- CONFIG: EXCLUSION LISTS ---
+EXCLUDED_KEYWORDS = ['ethiopian', 'ethiopia', 'amharic', 'oromo', 'tigray', 'wolayta', 'hope music']
+DROP_CHANNELS = [
+    'Liham Melody', 'Hope Music Ethiopia', 'Minew Shewa Tube',
+    'Fana Television', 'EBS TV', 'Propictures', 'Merih Media',
+    'Cinemax Entertainment', 'Habesha Music', 'ADMAS MUSIC'
+]
+
+EXCLUSIONS_FILE = os.environ.get("MMA_EXCLUSIONS_FILE", "exclusions.json")
+
+
+class ExclusionFilter:
+    """Compiled keyword/channel exclusion rules.
+
+    Titles are excluded when their lowercase form contains any keyword;
+    rows are excluded when ``Channel Name`` is exactly one of the drop
+    channels. Missing titles are kept.
+    """
+
+    def __init__(self, keywords=EXCLUDED_KEYWORDS, drop_channels=DROP_CHANNELS):
+        self.keywords = tuple(k.lower() for k in keywords if k)
+        self.drop_channels = frozenset(drop_channels)
+        self._pattern = re.compile('|'.join(map(re.escape, self.keywords))) if self.keywords else None
+
+        payload = json.dumps([sorted(self.keywords), sorted(self.drop_channels)])
+        self.key = hashlib.blake2b(payload.encode('utf-8'), digest_size=8).hexdigest()
+
+    def title_mask(self, titles):
+        """Boolean mask of titles to keep, aligned with ``titles``."""
+        if self._pattern is None:
+            return np.ones(len(titles), dtype=bool)
+        codes, uniques = pd.factorize(titles)
+        uniques = pd.Series(uniques, dtype=object)
+        is_str = uniques.map(type).eq(str).to_numpy()
+        hit = np.zeros(len(uniques), dtype=bool)
+        if is_str.any():
+            lowered = uniques[is_str].str.lower()
+            hit[is_str] = lowered.str.contains(self._pattern, regex=True).to_numpy()
+        # factorize marks missing values with -1; those are always kept
+        keep = np.append(~hit, True)
+        return keep[codes]
+
+    def channel_mask(self, channels):
+        """Boolean mask of rows whose channel is not dropped."""
+        if not self.drop_channels:
+            return np.ones(len(channels), dtype=bool)
+        return ~np.asarray(channels.isin(self.drop_channels))
+
+    def apply(self, df):
+        mask = np.ones(len(df), dtype=bool)
+        if 'Channel Name' in df.columns:
+            mask &= self.channel_mask(df['Channel Name'])
+        if 'Video Title' in df.columns:
+            mask &= self.title_mask(df['Video Title'])
+        return df[mask]
+
+
+def load_exclusion_filter(path=None):
+    """Build a filter from ``path`` (or ``EXCLUSIONS_FILE``), falling back to the defaults."""
+    path = path or EXCLUSIONS_FILE
+    if not os.path.exists(path):
+        return ExclusionFilter()
+    with open(path, encoding='utf-8') as fh:
+        config = json.load(fh)
+    return ExclusionFilter(
+        keywords=config.get('keywords', EXCLUDED_KEYWORDS),
+        drop_channels=config.get('drop_channels', DROP_CHANNELS),
+    )
@@ -0,0 +1,151 @@
+"""Per-video view decay fitted from History Log snapshots.
+
+Between two scrapes a video gains ``ΔView Count / Δdays`` views per day.
+:func:`fit_decay` fits ``log(rate) = a - decay * t`` to those rates for every
+video at once: the rows are sorted by video and date, and the least-squares
+sums are accumulated per video with ``np.bincount``, so there is no Python
+loop over videos. A video whose views are growing gets ``decay = 0`` and is
+projected flat rather than extrapolated upwards.
+
+:func:`with_forecasts` integrates the fitted curve over the next month and
+year, which the Ghost Income and Monthly Salary metrics then use in place of
+``Avg_Daily_Views`` x days.
+"""
+
+import numpy as np
+import pandas as pd
+
+from analytics.matching import normalize_titles
+
+# Projection horizon in days -> column added by with_forecasts.
+FORECAST_COLUMNS = {30: 'Forecast_Monthly_Views', 365: 'Forecast_Annual_Views'}
+
+# Daily decay rates are capped here (about a 50% drop every 3.5 days).
+MAX_DECAY = 0.2
+
+_DAY = np.timedelta64(1, 'D')
+
+
+def fit_decay(df_history):
+    """Fit one decay curve per video.
+
+    Videos are keyed by ``Video_ID`` when the log has it, otherwise by
+    ``Video Title``. Returns a frame indexed by that key with the latest
+    ``Video Title``, ``Last_Scraped``, the fitted ``Daily_Rate`` at the last
+    scrape, the per-day ``Decay``, the number of ``Intervals`` used and the
+    ``Title_Key`` that :func:`with_forecasts` matches rows without a
+    ``Video_ID`` by. ``Title_Key`` is blank where a more recently scraped fit
+    has the same normalized title. Videos seen in fewer than two snapshots
+    are left out.
+    """
+    columns = ['Video Title', 'Last_Scraped', 'Daily_Rate', 'Decay', 'Intervals', 'Title_Key']
+    key = 'Video_ID' if 'Video_ID' in df_history.columns else 'Video Title'
+    if df_history.empty:
+        return pd.DataFrame(columns=columns).rename_axis(key)
+
+    df = df_history.dropna(subset=[key, 'Date_Scraped', 'View Count'])
+    if df.empty:
+        return pd.DataFrame(columns=columns).rename_axis(key)
+    codes, videos = pd.factorize(df[key])
+    days = ((df['Date_Scraped'].to_numpy() - df['Date_Scraped'].min().to_datetime64()) / _DAY).astype(float)
+    order = np.lexsort((days, codes))
+    codes, days = codes[order], days[order]
+    views = df['View Count'].to_numpy(dtype=float)[order]
+    titles = df['Video Title'].to_numpy(dtype=object)[order]
+
+    # Consecutive snapshots of the same video form one interval.
+    same = (codes[1:] == codes[:-1]) & (days[1:] > days[:-1])
+    gained = np.diff(views)
+    # Falling counts are scrape errors; stalled videos keep a floor of 1 view/day.
+    same &= gained >= 0
+    span = np.diff(days)[same]
+    rate = np.maximum(gained[same], span) / span
+    group = codes[1:][same]
+    t = (days[1:][same] + days[:-1][same]) / 2
+    y = np.log(rate)
+
+    n_videos = len(videos)
+    n = np.bincount(group, minlength=n_videos).astype(float)
+    fitted = n > 0
+    sum_t = np.bincount(group, t, n_videos)
+    sum_y = np.bincount(group, y, n_videos)
+    mean_t = np.divide(sum_t, n, out=np.zeros(n_videos), where=fitted)
+    mean_y = np.divide(sum_y, n, out=np.zeros(n_videos), where=fitted)
+    dt = t - mean_t[group]
+    var_t = np.bincount(group, dt * dt, n_videos)
+    cov_ty = np.bincount(group, dt * (y - mean_y[group]), n_videos)
+    slope = np.divide(cov_ty, var_t, out=np.zeros(n_videos), where=var_t > 0)
+    decay = np.clip(-slope, 0.0, MAX_DECAY) + 0.0
+
+    # The last row of each video holds its latest scrape.
+    last = np.flatnonzero(np.r_[codes[1:] != codes[:-1], True])
+    last_day = days[last]
+    daily_rate = np.exp(mean_y - decay * (last_day - mean_t))
+
+    fits = pd.DataFrame({
+        'Video Title': titles[last],
+        'Last_Scraped': df['Date_Scraped'].min() + pd.to_timedelta(last_day, unit='D'),
+        'Daily_Rate': daily_rate,
+        'Decay': decay,
+        'Intervals': n.astype(int),
+    }, index=pd.Index(np.asarray(videos, dtype=object), name=key))[fitted]
+
+    # Titles are normalized here, once per fit, rather than on every
+    # with_forecasts call. When several fits share a title, the most recently
+    # scraped one keeps the key.
+    title_key = normalize_titles(fits['Video Title'])
+    recent = np.argsort(fits['Last_Scraped'].to_numpy(), kind='stable')
+    shadowed = np.zeros(len(fits), dtype=bool)
+    shadowed[recent] = title_key.iloc[recent].duplicated(keep='last').to_numpy()
+    return fits.assign(Title_Key=title_key.where(~shadowed).to_numpy())
+
+
+def forecast_views(fits, days, now=None):
+    """Views each fitted video is expected to gain over the ``days`` after ``now``.
+
+    ``now`` defaults to each video's ``Last_Scraped``.
+    """
+    decay = fits['Decay'].to_numpy(dtype=float)
+    rate = fits['Daily_Rate'].to_numpy(dtype=float)
+    if now is not None:
+        elapsed = ((pd.Timestamp(now) - fits['Last_Scraped']) / pd.Timedelta(days=1)).clip(lower=0).to_numpy()
+        rate = rate * np.exp(-decay * elapsed)
+    # Integral of rate * exp(-decay * t) over [0, days]; flat when decay is 0.
+    safe = np.where(decay > 0, decay, 1.0)
+    total = np.where(decay > 0, rate * -np.expm1(-decay * days) / safe, rate * days)
+    return pd.Series(total, index=fits.index)
+
+
+def with_forecasts(df, fits, now=None):
+    """Copy of ``df`` with a :data:`FORECAST_COLUMNS` column per horizon.
+
+    Rows are matched to fits by ``Video_ID`` when both frames have it,
+    otherwise by normalized title against the fits' ``Title_Key`` (see
+    :func:`analytics.matching.normalize_titles`). Videos without a fit get
+    ``NaN`` and fall back to ``Avg_Daily_Views``.
+    """
+    df = df.copy()
+    if fits.index.name == 'Video_ID' and 'Video_ID' in df.columns:
+        keys = df['Video_ID']
+        lookup = pd.Series(np.arange(len(fits)), index=fits.index)
+    else:
+        keys = normalize_titles(df['Video Title'])
+        titled = fits['Title_Key'].notna().to_numpy()
+        lookup = pd.Series(np.flatnonzero(titled), index=fits['Title_Key'].to_numpy()[titled])
+    position = keys.reset_index(drop=True).map(lookup).to_numpy()
+    matched = ~pd.isna(position)
+    for days, col in FORECAST_COLUMNS.items():
+        projected = forecast_views(fits, days, now).to_numpy()
+        values = np.full(len(df), np.nan)
+        values[matched] = projected[position[matched].astype(int)]
+        df[col] = values
+    return df
+
+
+def projected_views(df, days):
+    """Views over the next ``days``: the decay forecast where ``df`` has one, flat ``Avg_Daily_Views`` otherwise."""
+    flat = df['Avg_Daily_Views'] * days
+    col = FORECAST_COLUMNS.get(days)
+    if col in df.columns:
+        return df[col].fillna(flat)
+    return flat
@@ -0,0 +1,166 @@
+"""Incremental snapshot-to-snapshot growth for the Weekly Pitch tab.
+
+A :class:`GrowthIndex` keeps one deduplicated, key-indexed frame per scrape
+date plus running per-artist totals. Adding a snapshot only computes the
+delta against the previous one, and any two stored snapshots can be
+compared with a single index-aligned subtraction.
+
+Each consecutive delta is also scored by a per-video and a per-artist
+:class:`~analytics.anomalies.AnomalyDetector` as it is added, so outlier
+flags are maintained incrementally alongside the growth itself.
+
+An index may be shared between threads (the dashboard caches one per
+dataset for every session); :meth:`GrowthIndex.extend` serializes updates.
+"""
+
+import threading
+
+import pandas as pd
+
+from analytics.anomalies import ANOMALY_KINDS, AnomalyDetector
+
+SNAPSHOT_COLUMNS = ['Video Title', 'View Count', 'Clean_Artist_Name', 'Is_Identified']
+VELOCITY_COLUMNS = ['Date_Scraped', 'Clean_Artist_Name', 'View Count', 'Previous_Views', 'New_Views', 'Flagged_Views', 'Anomaly']
+
+
+class GrowthIndex:
+    """Per-video and per-artist ``Views_Gained`` across History Log snapshots.
+
+    Videos are keyed by ``Video_ID`` when the log has it, otherwise by
+    ``Video Title``. Snapshots must be added in ``Date_Scraped`` order.
+    Growth frames carry an ``Anomaly`` column (see :mod:`analytics.anomalies`).
+    """
+
+    def __init__(self, key='Video_ID'):
+        self.key = key
+        self.dates = []
+        self._snapshots = {}
+        self._pair_growth = {}
+        self._last_artist_views = pd.Series(dtype='float64')
+        self._velocity = []
+        self._velocity_frame = None
+        self.video_anomalies = AnomalyDetector()
+        self.artist_anomalies = AnomalyDetector()
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_history(cls, df_history):
+        key = 'Video_ID' if 'Video_ID' in df_history.columns else 'Video Title'
+        index = cls(key)
+        index.extend(df_history)
+        return index
+
+    def extend(self, df_history):
+        """Add every snapshot in ``df_history`` newer than the last indexed one.
+
+        Older rows are ignored, so calling this with a cumulative history only
+        pays for the new weeks. Returns the number of snapshots added.
+        """
+        if df_history.empty:
+            return 0
+        # Concurrent callers with the same history wait here; the later one
+        # then finds its weeks already indexed and adds nothing.
+        with self._lock:
+            if self.dates:
+                df_history = df_history[df_history['Date_Scraped'] > self.dates[-1]]
+            added = 0
+            for date, snapshot in df_history.groupby('Date_Scraped', sort=True):
+                self.add_snapshot(date, snapshot)
+                added += 1
+            return added
+
+    def add_snapshot(self, date, snapshot):
+        """Register the rows scraped on ``date`` and compute its delta to the previous snapshot."""
+        date = pd.Timestamp(date)
+        if self.dates and date <= self.dates[-1]:
+            raise ValueError(f"Snapshot {date:%Y-%m-%d} is not newer than {self.dates[-1]:%Y-%m-%d}")
+
+        frame = snapshot.drop_duplicates(self.key).set_index(self.key)
+        if self.key == 'Video Title':
+            frame['Video Title'] = frame.index
+        frame = frame[[c for c in SNAPSHOT_COLUMNS if c in frame.columns]]
+        self._snapshots[date] = frame
+        self.dates.append(date)
+
+        growth = None
+        days = 1.0
+        if len(self.dates) > 1:
+            prev = self.dates[-2]
+            days = (date - prev) / pd.Timedelta(days=1)
+            growth = self._diff(prev, date)
+            growth['Anomaly'] = self.video_anomalies.update(growth['Views_Gained'], days)
+            self._pair_growth[(prev, date)] = growth
+
+        if 'Clean_Artist_Name' in frame.columns:
+            # Key on plain labels: categorical indices built from frames with
+            # different category counts use different code widths and cannot
+            # be reindexed against each other.
+            totals = frame.groupby('Clean_Artist_Name', observed=True)['View Count'].sum().astype('float64')
+            totals.index = totals.index.astype(object)
+            previous = self._last_artist_views.reindex(totals.index)
+            step = pd.DataFrame({
+                'Date_Scraped': date,
+                'Clean_Artist_Name': totals.index,
+                'View Count': totals.to_numpy(),
+                'Previous_Views': previous.to_numpy(),
+            })
+            step['New_Views'] = step['View Count'] - step['Previous_Views']
+            flagged = pd.Series(dtype='float64')
+            if growth is not None:
+                hits = growth[growth['Anomaly'].notna()]
+                flagged = hits.groupby('Clean_Artist_Name', observed=True)['Views_Gained'].sum().astype('float64')
+                flagged.index = flagged.index.astype(object)
+            step['Flagged_Views'] = flagged.reindex(totals.index, fill_value=0.0).to_numpy()
+            step['Anomaly'] = self.artist_anomalies.update(step.set_index('Clean_Artist_Name')['New_Views'], days).to_numpy()
+            self._velocity.append(step)
+            self._velocity_frame = None
+            self._last_artist_views = totals.combine_first(self._last_artist_views)
+
+    def _diff(self, prev, latest):
+        now = self._snapshots[latest]
+        before = self._snapshots[prev]['View Count'].reindex(now.index)
+        growth = now.copy()
+        growth['View Count_now'] = now['View Count']
+        growth['View Count_prev'] = before
+        growth['Views_Gained'] = growth['View Count_now'] - before
+        return growth.drop(columns=['View Count'])
+
+    def video_growth(self, prev=None, latest=None):
+        """Per-video growth between two snapshots (defaults to the two most recent).
+
+        Videos missing from ``prev`` keep a missing ``Views_Gained``, matching
+        a left join on the newer snapshot.
+        """
+        if len(self.dates) < 2:
+            raise ValueError("Need at least 2 snapshots to calculate growth")
+        latest = pd.Timestamp(latest) if latest is not None else self.dates[-1]
+        prev = pd.Timestamp(prev) if prev is not None else self.dates[self.dates.index(latest) - 1]
+        cached = self._pair_growth.get((prev, latest))
+        if cached is not None:
+            return cached
+        # A video is flagged across a longer span if any week inside it was.
+        growth = self._diff(prev, latest)
+        steps = self.dates[self.dates.index(prev):self.dates.index(latest) + 1]
+        flags = pd.Series(dtype=object)
+        for a, b in zip(steps, steps[1:]):
+            flags = flags.combine_first(self._pair_growth[(a, b)]['Anomaly'].dropna().astype(object))
+        growth['Anomaly'] = pd.Categorical(flags.reindex(growth.index), categories=ANOMALY_KINDS)
+        return growth
+
+    def artist_growth(self, prev=None, latest=None):
+        """Per-artist ``Views_Gained`` between two snapshots."""
+        growth = self.video_growth(prev, latest)
+        return growth.groupby('Clean_Artist_Name', observed=True)['Views_Gained'].sum()
+
+    def artist_velocity(self):
+        """Week-over-week change in each artist's total views, one row per artist and snapshot.
+
+        ``Flagged_Views`` is the part of ``New_Views`` coming from flagged
+        videos; ``Anomaly`` flags the artist's own total.
+        """
+        with self._lock:
+            if not self._velocity:
+                return pd.DataFrame(columns=VELOCITY_COLUMNS)
+            if self._velocity_frame is None:
+                self._velocity_frame = pd.concat(self._velocity, ignore_index=True)
+            return self._velocity_frame
@@ -0,0 +1,280 @@
+"""Parsing and normalization of the uploaded CSV files.
+
+Two file kinds are recognized by their columns:
+
+* **History Log** - weekly scrape snapshots, detected by ``Date_Scraped``.
+  Any number may be uploaded; they are merged into one history.
+* **Detailed Analytics** - one row per video, detected by ``Clean_Artist_Name``.
+"""
+
+import csv
+import hashlib
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from analytics.filters import ExclusionFilter
+from analytics.matching import METHODS, ArtistMatcher
+
+HISTORY_RENAMES = {'Video_Title': 'Video Title', 'View_Count': 'View Count', 'Channel_Name': 'Channel Name'}
+
+# Rows per chunk when streaming a History Log; bounds the parser's working set.
+CHUNK_ROWS = 250_000
+
+# Pinned dtypes for History Log columns, keyed by the normalized column name.
+# View counts are read as text and coerced per chunk (see
+# :func:`coerce_views`), so one malformed cell does not fail the whole file.
+HISTORY_DTYPES = {
+    'Video_ID': 'string',
+    'Video Title': 'string',
+    'View Count': 'string',
+    'Channel Name': 'category',
+    'Clean_Artist_Name': 'category',
+}
+CATEGORY_COLUMNS = ['Channel Name', 'Clean_Artist_Name']
+
+# A video has at most one row per scrape; ``Video Title`` stands in for rows
+# without a ``Video_ID``.
+DEDUP_KEYS = ['Video_ID', 'Date_Scraped']
+
+
+def content_key(files):
+    """Return a digest of the uploaded ``(name, bytes)`` pairs.
+
+    The digest only depends on file contents and order, so re-uploading the
+    same CSV under a new session hits the same cache entry.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for _, data in files:
+        h.update(len(data).to_bytes(8, 'little'))
+        h.update(hashlib.blake2b(data, digest_size=16).digest())
+    return h.hexdigest()
+
+
+def read_csv_bytes(data):
+    try:
+        return pd.read_csv(io.BytesIO(data), on_bad_lines='skip')
+    except Exception:
+        return pd.read_csv(io.BytesIO(data))
+
+
+def read_header(data):
+    return pd.read_csv(io.BytesIO(data), nrows=0).columns.tolist()
+
+
+def count_bad_lines(data, n_fields, n_rows):
+    """Count the records of a CSV the C parser skips for having more than ``n_fields`` fields.
+
+    ``n_rows`` is how many data rows the parser returned. When every line
+    below the header became a row nothing was skipped, which settles the
+    common case with one byte count; otherwise the records are re-tokenized
+    with :mod:`csv`. Unlike capturing the parser's warnings this touches no
+    process-wide state, so it is safe on the parsing threads.
+    """
+    lines = data.count(b'\n') + (not data.endswith(b'\n'))
+    if lines - 1 <= n_rows:
+        return 0
+    reader = csv.reader(io.TextIOWrapper(io.BytesIO(data), encoding='utf-8', errors='replace', newline=''))
+    next(reader, None)
+    return sum(len(row) > n_fields for row in reader)
+
+
+def coerce_views(values):
+    """Parse view counts to ``Int64``; returns ``(views, n_invalid)``.
+
+    Thousands separators (``"1,234"``) are accepted. Cells that still do not
+    parse become missing and are counted in ``n_invalid``.
+    """
+    text = values.str.replace(',', '', regex=False).str.strip()
+    views = pd.to_numeric(text, errors='coerce')
+    invalid = int((text.notna() & (text != '') & views.isna()).sum())
+    return views.round().astype('Int64'), invalid
+
+
+def iter_history_chunks(data, exclusions=None, chunksize=CHUNK_ROWS, stats=None):
+    """Stream a History Log CSV as normalized, filtered chunks.
+
+    Columns are parsed straight into their pinned dtypes and every chunk is
+    screened by ``exclusions`` before the next one is read, so the parser
+    never holds more than ``chunksize`` raw rows. Counters for rows read,
+    rows kept, skipped bad lines and unparseable ``View Count`` cells
+    (``bad_views``) are accumulated into ``stats``.
+    """
+    exclusions = exclusions or ExclusionFilter()
+    stats = stats if stats is not None else {}
+    for key in ('rows_read', 'rows_kept', 'bad_lines', 'bad_views'):
+        stats.setdefault(key, 0)
+
+    raw_names = {raw: HISTORY_RENAMES.get(raw, raw) for raw in read_header(data)}
+    dtype = {raw: HISTORY_DTYPES[name] for raw, name in raw_names.items() if name in HISTORY_DTYPES}
+
+    rows = 0
+    reader = pd.read_csv(io.BytesIO(data), dtype=dtype, chunksize=chunksize, on_bad_lines='skip')
+    for chunk in reader:
+        rows += len(chunk)
+        stats['rows_read'] += len(chunk)
+        chunk = chunk.rename(columns=HISTORY_RENAMES)
+        if 'View Count' in chunk.columns:
+            chunk['View Count'], invalid = coerce_views(chunk['View Count'])
+            stats['bad_views'] += invalid
+        chunk['Date_Scraped'] = pd.to_datetime(chunk['Date_Scraped'], errors='coerce')
+        chunk = exclusions.apply(chunk.dropna(subset=['Date_Scraped']))
+        stats['rows_kept'] += len(chunk)
+        yield chunk
+
+    stats['bad_lines'] += count_bad_lines(data, len(raw_names), rows)
+
+
+def _missing(template, n):
+    """``n`` missing values with the dtype of ``template`` (a column another chunk has)."""
+    if isinstance(template.dtype, pd.CategoricalDtype):
+        return pd.Categorical.from_codes(np.full(n, -1), categories=template.cat.categories[:0])
+    return pd.Series(pd.NA, index=range(n), dtype=template.dtype).array
+
+
+def concat_chunks(chunks):
+    """Concatenate chunks, merging per-chunk categories instead of falling back to object.
+
+    Chunks may come from logs with different columns: the result has every
+    column any chunk has, in order of first appearance, missing where a
+    chunk lacks it.
+    """
+    chunks = list(chunks)
+    if not chunks:
+        return pd.DataFrame()
+    columns = list(dict.fromkeys(col for c in chunks for col in c.columns))
+    templates = {col: next(c[col] for c in chunks if col in c.columns) for col in columns}
+    chunks = [
+        c.assign(**{col: _missing(templates[col], len(c)) for col in columns if col not in c.columns})
+        for c in chunks
+    ]
+    merged = {}
+    for col in CATEGORY_COLUMNS:
+        if col in columns:
+            merged[col] = union_categoricals([c[col] for c in chunks])
+    df = pd.concat([c[columns].drop(columns=list(merged)) for c in chunks], ignore_index=True)
+    for col, values in merged.items():
+        df[col] = values
+    return df[columns]
+
+
+def read_history(data, exclusions=None, chunksize=CHUNK_ROWS, stats=None):
+    return concat_chunks(iter_history_chunks(data, exclusions, chunksize, stats))
+
+
+def _present(df, column):
+    """``df[column]`` as objects with blank cells as ``None``; all ``None`` if the column is missing."""
+    if column not in df.columns:
+        return pd.Series(None, index=df.index, dtype=object)
+    values = df[column].astype(object)
+    return values.where(values.notna() & (values.astype(str).str.strip() != ''), None)
+
+
+def merge_histories(frames, stats=None):
+    """Merge History Logs into one frame sorted by ``Date_Scraped``.
+
+    Rows repeating a (``Video_ID``, ``Date_Scraped``) pair already seen are
+    dropped, keeping the one from the latest frame. Rows without a
+    ``Video_ID`` (from a log lacking the column, or a blank cell) are keyed by
+    ``Video Title`` instead, and rows with neither are always kept. Keys are
+    compared by their 64-bit hash, so the pass is a single ``duplicated`` over
+    integers rather than a multi-column sort. ``stats``, if given, is a list of per-frame dicts
+    that receive a ``duplicates`` count.
+    """
+    frames = list(frames)
+    source = np.repeat(np.arange(len(frames)), [len(f) for f in frames])
+    df = concat_chunks(f for f in frames if not f.empty)
+    if df.empty:
+        return df
+
+    video, scraped = DEDUP_KEYS
+    ids, titles = _present(df, video), _present(df, 'Video Title')
+    by_id = ids.notna()
+    keys = pd.DataFrame({'by_id': by_id, 'key': ids.where(by_id, titles), scraped: df[scraped]})
+    hashes = pd.util.hash_pandas_object(keys, index=False).to_numpy()
+    # A row without any key is never a duplicate of another keyless row.
+    dup = pd.Series(hashes).duplicated(keep='last').to_numpy() & keys['key'].notna().to_numpy()
+    if stats is not None:
+        counts = np.bincount(source[dup], minlength=len(frames))
+        for s, n in zip(stats, counts):
+            s['duplicates'] = s.get('duplicates', 0) + int(n)
+    if dup.any():
+        df = df[~dup]
+    return df.sort_values('Date_Scraped', kind='stable', ignore_index=True)
+
+
+def build_artist_map(df_static):
+    """Title/ID -> artist matcher for the Detailed Analytics frame (see :mod:`analytics.matching`)."""
+    return ArtistMatcher(df_static)
+
+
+def attach_artists(df_history, artist_map):
+    """Label history rows with ``Clean_Artist_Name``, ``Is_Identified`` and ``Match_Method``.
+
+    Rows the matcher cannot resolve fall back to their ``Channel Name``.
+    """
+    df_history = df_history.copy()
+    if df_history.empty:
+        df_history['Is_Identified'] = False
+    elif artist_map:
+        artists, methods = artist_map.match(df_history)
+        df_history['Clean_Artist_Name'] = artists
+        df_history['Is_Identified'] = df_history['Clean_Artist_Name'].notna()
+        df_history['Match_Method'] = pd.Categorical(methods, categories=METHODS)
+        df_history['Clean_Artist_Name'] = df_history['Clean_Artist_Name'].fillna(df_history['Channel Name'].astype(object))
+    elif 'Clean_Artist_Name' not in df_history.columns:
+        df_history['Clean_Artist_Name'] = df_history.get('Channel Name', 'Unknown')
+        df_history['Is_Identified'] = False
+    if 'Clean_Artist_Name' in df_history.columns:
+        df_history['Clean_Artist_Name'] = df_history['Clean_Artist_Name'].astype('category')
+    return df_history
+
+
+def load_datasets(files, exclusions=None, chunksize=CHUNK_ROWS, workers=None):
+    """Parse ``(name, bytes)`` uploads into ``(df_history, df_static, artist_map, stats)``.
+
+    History Logs are streamed in ``chunksize`` row chunks (see
+    :func:`iter_history_chunks`) and screened with ``exclusions`` (an
+    :class:`~analytics.filters.ExclusionFilter`, defaults to the built-in
+    lists). Every History Log is parsed on a pool of ``workers`` threads and
+    the results are combined by :func:`merge_histories`; a later Detailed
+    Analytics file replaces an earlier one. The returned history is already
+    labelled with artists, so callers only need to apply the sidebar filters
+    and assumptions on top. ``stats`` maps each History Log file name to its
+    row, bad-line and duplicate counters.
+    """
+    df_static = pd.DataFrame()
+    artist_map = None
+    history_files = []
+
+    for name, data in files:
+        cols = read_header(data)
+
+        if 'Date_Scraped' in cols:
+            history_files.append((name, data))
+        elif 'Clean_Artist_Name' in cols:
+            df_static = read_csv_bytes(data)
+            artist_map = build_artist_map(df_static)
+
+    file_stats = [{} for _ in history_files]
+    workers = workers or min(len(history_files), os.cpu_count() or 1) or 1
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        frames = list(pool.map(
+            lambda job: read_history(job[0], exclusions, chunksize, job[1]),
+            [(data, s) for (_, data), s in zip(history_files, file_stats)],
+        ))
+    df_history = merge_histories(frames, file_stats)
+
+    stats = {}
+    for (name, _), s in zip(history_files, file_stats):
+        # Same-named uploads share one entry.
+        for key, value in s.items():
+            stats.setdefault(name, {}).setdefault(key, 0)
+            stats[name][key] += value
+
+    df_history = attach_artists(df_history, artist_map)
+    return df_history, df_static, artist_map, stats
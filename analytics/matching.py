@@ -0,0 +1,214 @@
+"""Map History Log rows to ``Clean_Artist_Name`` from the Detailed Analytics file.
+
+Each distinct history video is resolved by the first rule that matches:
+
+1. ``id`` - same ``Video_ID`` in both files.
+2. ``exact`` - identical ``Video Title``.
+3. ``normalized`` - identical title after case folding, accent and
+   punctuation stripping and removing noise such as "(Official Video)".
+4. ``fuzzy`` - MinHash over character 3-grams, bucketed with LSH banding,
+   so only titles that share a band are compared. The best candidate whose
+   estimated Jaccard similarity reaches ``threshold`` wins.
+
+Work is proportional to the number of distinct titles rather than their
+pairwise product. Queries are matched in batches and each keeps at most
+``MAX_CANDIDATES`` references (those sharing the most bands), so templated
+catalogs, where every title shares a band with hundreds of others, stay in
+bounded memory.
+"""
+
+import unicodedata
+import zlib
+
+import numpy as np
+import pandas as pd
+
+METHODS = ['id', 'exact', 'normalized', 'fuzzy', 'unmatched']
+
+ID_COLUMNS = ['Video_ID', 'Video ID', 'video_id', 'videoId']
+NOISE_PATTERN = (
+    r'\b(official|music|lyric|lyrics|video|audio|visualizer|hd|4k|hq|mv|clip|full)\b'
+)
+
+SHINGLE = 3
+N_HASHES = 32
+BANDS = 8
+# Buckets larger than this are skipped; they only hold near-empty titles.
+MAX_BUCKET = 200
+# References scored per query, and the batch sizes that bound the pair tables.
+MAX_CANDIDATES = 32
+QUERY_BATCH = 4_096
+PAIR_BATCH = 65_536
+_PRIME = (1 << 31) - 1
+
+
+def normalize_titles(titles):
+    """Case-folded, accent-free, punctuation-free titles with noise words removed."""
+    titles = pd.Series(titles, dtype=object).fillna('').astype(str)
+    folded = titles.map(lambda t: unicodedata.normalize('NFKD', t).encode('ascii', 'ignore').decode('ascii'))
+    folded = folded.str.casefold()
+    folded = folded.str.replace(r'[^0-9a-z]+', ' ', regex=True)
+    folded = folded.str.replace(NOISE_PATTERN, ' ', regex=True)
+    return folded.str.split().str.join(' ')
+
+
+def _shingle_ids(texts):
+    """Flat array of hashed character shingles and each text's start offset."""
+    ids, offsets = [], [0]
+    for text in texts:
+        padded = f" {text} "
+        grams = {padded[i:i + SHINGLE] for i in range(max(1, len(padded) - SHINGLE + 1))}
+        ids.extend(zlib.crc32(g.encode('utf-8')) % _PRIME for g in grams)
+        offsets.append(len(ids))
+    return np.asarray(ids, dtype=np.int64), np.asarray(offsets, dtype=np.int64)
+
+
+def minhash_signatures(texts, n_hashes=N_HASHES, seed=0, batch=200_000):
+    """``(len(texts), n_hashes)`` MinHash signatures of the texts' character shingles."""
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, _PRIME, n_hashes, dtype=np.int64)
+    b = rng.integers(0, _PRIME, n_hashes, dtype=np.int64)
+
+    ids, offsets = _shingle_ids(texts)
+    signatures = np.empty((len(texts), n_hashes), dtype=np.int64)
+    # Hash in shingle batches aligned to text boundaries to bound memory.
+    start = 0
+    while start < len(texts):
+        stop = int(np.searchsorted(offsets, offsets[start] + batch, side='right'))
+        stop = min(max(stop - 1, start + 1), len(texts))
+        lo, hi = offsets[start], offsets[stop]
+        hashed = (a[:, None] * ids[None, lo:hi] + b[:, None]) % _PRIME
+        signatures[start:stop] = np.minimum.reduceat(hashed, offsets[start:stop] - lo, axis=1).T
+        start = stop
+    return signatures
+
+
+def _band_keys(signatures, bands=BANDS):
+    rows = signatures.shape[1] // bands
+    keys = np.empty((len(signatures), bands), dtype=np.uint64)
+    for band in range(bands):
+        part = np.ascontiguousarray(signatures[:, band * rows:(band + 1) * rows])
+        keys[:, band] = pd.util.hash_array(part.view(np.dtype((np.void, part.dtype.itemsize * rows))).ravel())
+    return keys
+
+
+class ArtistMatcher:
+    """Lookup tables built once from the Detailed Analytics frame.
+
+    ``len(matcher)`` is the number of distinct reference titles, so an empty
+    matcher is falsy like the plain dict it replaces.
+    """
+
+    def __init__(self, df_static, threshold=0.6):
+        self.threshold = threshold
+        ref = df_static.dropna(subset=['Clean_Artist_Name'])
+
+        self.by_title = ref.drop_duplicates('Video Title').set_index('Video Title')['Clean_Artist_Name']
+        id_col = next((c for c in ID_COLUMNS if c in ref.columns), None)
+        self.by_id = ref.drop_duplicates(id_col).set_index(id_col)['Clean_Artist_Name'] if id_col else None
+
+        normalized = normalize_titles(self.by_title.index).to_numpy()
+        keep = normalized != ''
+        self.by_normalized = pd.Series(self.by_title.to_numpy()[keep], index=normalized[keep])
+        self.by_normalized = self.by_normalized[~self.by_normalized.index.duplicated()]
+
+        self._ref_titles = self.by_normalized.index.to_numpy()
+        self._ref_signatures = minhash_signatures(self._ref_titles) if len(self._ref_titles) else None
+
+    def __len__(self):
+        return len(self.by_title)
+
+    def to_dict(self):
+        return self.by_title.to_dict()
+
+    def _fuzzy(self, texts):
+        """Best reference artist for each text, or ``None``, via LSH candidates."""
+        result = np.full(len(texts), None, dtype=object)
+        if self._ref_signatures is None or len(texts) == 0:
+            return result
+        query_sig = minhash_signatures(texts)
+        ref_keys = _band_keys(self._ref_signatures)
+        query_keys = _band_keys(query_sig)
+
+        buckets = []
+        for band in range(ref_keys.shape[1]):
+            ref = pd.DataFrame({'key': ref_keys[:, band], 'ref': np.arange(len(ref_keys))})
+            sizes = ref.groupby('key')['ref'].transform('size')
+            buckets.append(ref[sizes <= MAX_BUCKET])
+
+        for start in range(0, len(texts), QUERY_BATCH):
+            batch = np.arange(start, min(start + QUERY_BATCH, len(texts)))
+            pairs = pd.concat([
+                pd.DataFrame({'key': query_keys[batch, band], 'query': batch}).merge(bucket, on='key')[['query', 'ref']]
+                for band, bucket in enumerate(buckets)
+            ], ignore_index=True)
+            if pairs.empty:
+                continue
+            # Keep the references sharing the most bands, in first-seen order.
+            pairs = pairs.groupby(['query', 'ref'], sort=False).size().rename('bands').reset_index()
+            ranked = pairs.sort_values(['query', 'bands'], ascending=[True, False], kind='stable')
+            pairs = ranked.groupby('query', sort=False).head(MAX_CANDIDATES).sort_index()
+
+            q, r = pairs['query'].to_numpy(), pairs['ref'].to_numpy()
+            similarity = np.empty(len(pairs))
+            for lo in range(0, len(pairs), PAIR_BATCH):
+                hi = lo + PAIR_BATCH
+                similarity[lo:hi] = (query_sig[q[lo:hi]] == self._ref_signatures[r[lo:hi]]).mean(axis=1)
+            pairs['similarity'] = similarity
+            pairs = pairs[pairs['similarity'] >= self.threshold]
+            best = pairs.sort_values('similarity', ascending=False, kind='stable').drop_duplicates('query')
+            result[best['query'].to_numpy()] = self.by_normalized.to_numpy()[best['ref'].to_numpy()]
+        return result
+
+    def match(self, df_history):
+        """``(artists, methods)`` aligned with ``df_history``'s rows.
+
+        Matching runs on distinct (id, title) pairs; ``artists`` is missing
+        where ``methods`` is ``'unmatched'``.
+        """
+        id_col = 'Video_ID' if 'Video_ID' in df_history.columns else None
+        keys = df_history[[id_col, 'Video Title']] if id_col else df_history[['Video Title']]
+        keys = keys.astype(object)
+        codes = keys.groupby(list(keys.columns), sort=False, dropna=False).ngroup().to_numpy()
+        uniques = keys.drop_duplicates().reset_index(drop=True)
+
+        artist = pd.Series(np.full(len(uniques), None, dtype=object))
+        method = np.full(len(uniques), 'unmatched', dtype=object)
+
+        def fill(candidates, label):
+            hit = artist.isna().to_numpy() & pd.notna(candidates)
+            artist[hit] = np.asarray(candidates, dtype=object)[hit]
+            method[hit] = label
+
+        titles = uniques['Video Title']
+        if id_col and self.by_id is not None:
+            fill(uniques[id_col].map(self.by_id).to_numpy(), 'id')
+        fill(titles.map(self.by_title).to_numpy(), 'exact')
+
+        pending = artist.isna().to_numpy()
+        if pending.any():
+            normalized = normalize_titles(titles[pending]).to_numpy()
+            found = np.full(len(uniques), None, dtype=object)
+            found[pending] = pd.Series(normalized).map(self.by_normalized).to_numpy()
+            fill(found, 'normalized')
+
+            pending = artist.isna().to_numpy()
+            if pending.any():
+                # Fuzzy-match each distinct normalized title once.
+                texts = normalize_titles(titles[pending])
+                text_codes, text_uniques = pd.factorize(texts)
+                text_uniques = np.asarray(text_uniques, dtype=object)
+                fuzzy = np.full(len(text_uniques), None, dtype=object)
+                searchable = text_uniques != ''
+                fuzzy[searchable] = self._fuzzy(text_uniques[searchable])
+                found = np.full(len(uniques), None, dtype=object)
+                found[pending] = fuzzy[text_codes]
+                fill(found, 'fuzzy')
+
+        return artist.to_numpy()[codes], method[codes]
+
+
+def match_coverage(methods):
+    """Share of rows resolved by each method, in :data:`METHODS` order."""
+    counts = pd.Series(methods).value_counts(normalize=True)
+    return counts.reindex(METHODS, fill_value=0.0)
@@ -0,0 +1,142 @@
+"""Dashboard metrics as plain functions over DataFrames.
+
+Each function mirrors one tab of ``dashboard.py`` and takes the sidebar
+assumptions as arguments, so the same numbers can be produced from batch
+jobs and profiled without a Streamlit session.
+"""
+
+from collections import namedtuple
+
+import pandas as pd
+
+from analytics.aggregates import apply_assumptions, artist_base_stats, video_outcomes
+from analytics.forecast import projected_views
+
+RELEASE_DATE_COLUMNS = ['Published At', 'publishedAt', 'Release Date', 'release_date']
+
+MONTH_ORDER = ['January', 'February', 'March', 'April', 'May', 'June', 'July', 'August', 'September', 'October', 'November', 'December']
+DAY_ORDER = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+# A Deal Simulator verdict flips once the gap to the offer exceeds this many dollars.
+DEAL_TOSSUP_BAND = 1000
+
+DealProjection = namedtuple('DealProjection', ['median_views', 'revenue', 'profit', 'diff', 'verdict'])
+
+
+def select_primary(df_static, df_history):
+    """Pick the per-video frame the tabs run on and map its columns.
+
+    The Detailed Analytics file wins; otherwise the latest History Log
+    snapshot is used. Returns ``None`` when neither is available.
+    """
+    if not df_static.empty:
+        df = df_static.copy()
+    elif not df_history.empty:
+        latest_date = df_history['Date_Scraped'].max()
+        df = df_history[df_history['Date_Scraped'] == latest_date].copy()
+    else:
+        return None
+
+    for col in RELEASE_DATE_COLUMNS:
+        if col in df.columns:
+            df = df.rename(columns={col: 'Video Release Date'})
+            break
+    if 'Video Release Date' in df.columns:
+        df['Video Release Date'] = pd.to_datetime(df['Video Release Date'], errors='coerce')
+
+    if 'Clean_Artist_Name' not in df.columns:
+        df['Clean_Artist_Name'] = df.get('Channel Name', 'Unknown')
+    return df
+
+
+def asset_gap(df, rpm, flat_fee, prod_cost):
+    """Per-artist Asset Gap table (see :func:`analytics.aggregates.apply_assumptions`)."""
+    return apply_assumptions(artist_base_stats(df), rpm, flat_fee, prod_cost)
+
+
+def top_artists(artist_stats, n=15):
+    return artist_stats.sort_values('Actual_Revenue', ascending=False).head(n)
+
+
+def lottery(df, rpm, flat_fee, min_views=10000):
+    """Videos above ``min_views`` with their revenue and Lottery outcome."""
+    chart = df[df['View Count'] > min_views].copy()
+    chart['Actual_Revenue'], chart['Outcome'] = video_outcomes(chart['View Count'], rpm, flat_fee)
+    return chart
+
+
+def ghost_income(df, rpm, ghost_days, min_daily_views=100, now=None):
+    """Videos older than ``ghost_days`` still earning, with ``Est_Annual_Passive`` revenue.
+
+    Revenue follows the decay forecast when ``df`` carries one (see
+    :func:`analytics.forecast.with_forecasts`).
+    """
+    now = pd.Timestamp.now() if now is None else pd.Timestamp(now)
+    days_since = (now - pd.to_datetime(df['Video Release Date'])).dt.days
+    is_ghost = (days_since > ghost_days) & (df['Avg_Daily_Views'] > min_daily_views)
+    old_gold = df[is_ghost].copy()
+    old_gold['Days_Since_Release'] = days_since[is_ghost]
+    old_gold['Est_Annual_Passive'] = (projected_views(old_gold, 365) / 1000) * rpm
+    return old_gold.sort_values('Est_Annual_Passive', ascending=False)
+
+
+def deal_projection(views, rpm, cost, offer):
+    """Compare a flat-fee ``offer`` with going independent at the median of ``views``."""
+    median_views = pd.Series(views).median()
+    revenue = (median_views / 1000) * rpm
+    profit = revenue - cost
+    diff = profit - offer
+    if diff > DEAL_TOSSUP_BAND:
+        verdict = 'reject'
+    elif diff < -DEAL_TOSSUP_BAND:
+        verdict = 'take'
+    else:
+        verdict = 'tossup'
+    return DealProjection(median_views, revenue, profit, diff, verdict)
+
+
+def revenue_split(revenue, platform_cut):
+    """Split ``revenue`` into ``(artist_amount, platform_amount)`` for a platform cut in percent."""
+    return revenue * ((100 - platform_cut) / 100.0), revenue * (platform_cut / 100.0)
+
+
+def monthly_salary(artist_videos, rpm, artist_cut_pct, n_videos=5):
+    """Monthly pay stub for an artist's ``n_videos`` most recent releases (see :func:`ghost_income` on forecasts)."""
+    recent = artist_videos.sort_values('Video Release Date', ascending=False).head(n_videos).copy()
+    recent['Gross_Monthly'] = (projected_views(recent, 30) / 1000) * rpm
+    recent['Net_Monthly_Pay'] = recent['Gross_Monthly'] * (artist_cut_pct / 100.0)
+    return recent
+
+
+def release_heatmap(df):
+    """Median ``View Count`` by release month and weekday."""
+    released = pd.to_datetime(df['Video Release Date'])
+    return df.groupby([released.dt.month_name().rename('Month'), released.dt.day_name().rename('Day')])['View Count'].median().reset_index()
+
+
+def artist_report(df, rpm, flat_fee, prod_cost, ghost_days, platform_cut, now=None, n_salary_videos=5):
+    """Asset Gap, Ghost Income and Monthly Salary for every artist in one pass.
+
+    Returns one row per ``Clean_Artist_Name``. Ghost and salary columns are
+    zero when ``df`` lacks ``Video Release Date`` or ``Avg_Daily_Views``.
+    """
+    report = asset_gap(df, rpm, flat_fee, prod_cost).set_index('Clean_Artist_Name')
+    report = report.rename(columns={'View Count': 'Total_Views', 'Video Title': 'Video_Count'})
+
+    report['Ghost_Videos'] = 0
+    report['Est_Annual_Passive'] = 0.0
+    report['Net_Monthly_Pay'] = 0.0
+    if 'Video Release Date' in df.columns and 'Avg_Daily_Views' in df.columns:
+        old_gold = ghost_income(df, rpm, ghost_days, now=now)
+        ghost = old_gold.groupby('Clean_Artist_Name', observed=True)['Est_Annual_Passive'].agg(['count', 'sum'])
+        report.loc[ghost.index, 'Ghost_Videos'] = ghost['count']
+        report.loc[ghost.index, 'Est_Annual_Passive'] = ghost['sum']
+
+        artist_cut_pct = 100 - platform_cut
+        recent = df.sort_values('Video Release Date', ascending=False).groupby('Clean_Artist_Name', observed=True).head(n_salary_videos)
+        pay = (projected_views(recent, 30) / 1000) * rpm * (artist_cut_pct / 100.0)
+        salary = pay.groupby(recent['Clean_Artist_Name'], observed=True).sum()
+        report.loc[salary.index, 'Net_Monthly_Pay'] = salary
+
+    report['Annual_Salary'] = report['Net_Monthly_Pay'] * 12
+    return report.reset_index()
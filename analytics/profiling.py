@@ -0,0 +1,86 @@
+"""Opt-in wall time / row count / memory instrumentation for pipeline stages.
+
+    timer = StageTimer()
+    with timer.stage('ingest') as s:
+        df = load(...)
+        s.rows = len(df)
+
+A disabled timer still hands out stage objects but records nothing, so the
+call sites can stay in place in production.
+"""
+
+import json
+import os
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import pandas as pd
+
+PROFILE_LOG = os.environ.get("MMA_PROFILE_LOG", "dashboard_profile.jsonl")
+
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+def current_rss():
+    """Resident set size of this process in bytes, or ``None`` where unavailable."""
+    try:
+        with open('/proc/self/statm') as fh:
+            return int(fh.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class Stage:
+    __slots__ = ('name', 'rows')
+
+    def __init__(self, name):
+        self.name = name
+        self.rows = None
+
+
+class StageTimer:
+    """Collects one record per timed stage of a single run."""
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.run_id = uuid.uuid4().hex[:12]
+        self.records = []
+
+    @contextmanager
+    def stage(self, name):
+        stage = Stage(name)
+        if not self.enabled:
+            yield stage
+            return
+        rss_before = current_rss()
+        started = time.perf_counter()
+        try:
+            yield stage
+        finally:
+            elapsed = time.perf_counter() - started
+            rss_after = current_rss()
+            delta = rss_after - rss_before if rss_before is not None and rss_after is not None else None
+            self.records.append({
+                'stage': name,
+                'seconds': elapsed,
+                'rows': stage.rows,
+                'rss_delta_mb': delta / 2**20 if delta is not None else None,
+                'rss_mb': rss_after / 2**20 if rss_after is not None else None,
+            })
+
+    def total_seconds(self):
+        return sum(r['seconds'] for r in self.records)
+
+    def to_frame(self):
+        return pd.DataFrame(self.records, columns=['stage', 'seconds', 'rows', 'rss_delta_mb', 'rss_mb'])
+
+    def write_jsonl(self, path=None, **context):
+        """Append this run's records to a JSON-lines log, one line per stage."""
+        if not self.records:
+            return
+        timestamp = datetime.now(timezone.utc).isoformat(timespec='seconds')
+        with open(path or PROFILE_LOG, 'a', encoding='utf-8') as fh:
+            for record in self.records:
+                fh.write(json.dumps({'run_id': self.run_id, 'timestamp': timestamp, **context, **record}) + '\n')
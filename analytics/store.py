@@ -0,0 +1,108 @@
+"""On-disk columnar store for History Log snapshots.
+
+Each scrape date lives in its own Parquet partition::
+
+    history_store/
+        date=2026-01-01/part-0.parquet
+        date=2026-01-08/part-0.parquet
+
+New weekly logs are appended one partition at a time, and reads only open
+the partitions inside the requested date range and only the requested
+columns, so the cost of a read does not grow with the size of the archive.
+"""
+
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+STORE_DIR = os.environ.get("MMA_STORE_DIR", "history_store")
+
+# Derived at load time from the Detailed Analytics file, never persisted.
+DERIVED_COLUMNS = ['Clean_Artist_Name', 'Is_Identified', 'Match_Method']
+
+# Columns the dashboard reads. Every tab shares one history load, and each of
+# these has a consumer there: growth keys on Video_ID, artist matching on
+# Video Title, and unmatched rows fall back to Channel Name. Other columns a
+# log carried into the store are not decoded.
+DASHBOARD_COLUMNS = ['Date_Scraped', 'Video_ID', 'Video Title', 'View Count', 'Channel Name']
+
+PARTITION_PREFIX = 'date='
+
+
+class SnapshotStore:
+    """Date-partitioned Parquet archive of normalized History Log rows."""
+
+    def __init__(self, root=STORE_DIR):
+        self.root = root
+
+    def _partition_dir(self, day):
+        return os.path.join(self.root, f"{PARTITION_PREFIX}{day}")
+
+    def dates(self):
+        """Sorted ISO dates (``YYYY-MM-DD``) that have a partition."""
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(
+            name[len(PARTITION_PREFIX):] for name in os.listdir(self.root)
+            if name.startswith(PARTITION_PREFIX)
+            and os.path.exists(os.path.join(self.root, name, 'part-0.parquet'))
+        )
+
+    def version(self):
+        """Cheap fingerprint that changes whenever a partition is written."""
+        stamp = []
+        for day in self.dates():
+            path = os.path.join(self._partition_dir(day), 'part-0.parquet')
+            stamp.append((day, os.path.getmtime(path)))
+        return tuple(stamp)
+
+    def append(self, df_history, overwrite=False):
+        """Write one partition per scrape date in ``df_history``.
+
+        Dates that are already stored are skipped unless ``overwrite`` is set,
+        so re-appending the same cumulative log is a no-op. Returns the list of
+        dates that were written.
+        """
+        if df_history.empty:
+            return []
+        df_history = df_history.drop(columns=DERIVED_COLUMNS, errors='ignore')
+        existing = set(self.dates())
+        days = df_history['Date_Scraped'].dt.strftime('%Y-%m-%d')
+
+        written = []
+        for day, part in df_history.groupby(days, sort=True):
+            if day in existing and not overwrite:
+                continue
+            folder = self._partition_dir(day)
+            os.makedirs(folder, exist_ok=True)
+            tmp_path = os.path.join(folder, 'part-0.parquet.tmp')
+            pq.write_table(pa.Table.from_pandas(part, preserve_index=False), tmp_path)
+            os.replace(tmp_path, os.path.join(folder, 'part-0.parquet'))
+            written.append(day)
+        return written
+
+    def read(self, columns=None, start=None, end=None):
+        """Load the partitions between ``start`` and ``end`` (inclusive).
+
+        ``columns`` limits which columns are decoded; columns missing from a
+        partition are skipped rather than raising.
+        """
+        start = pd.Timestamp(start).strftime('%Y-%m-%d') if start is not None else None
+        end = pd.Timestamp(end).strftime('%Y-%m-%d') if end is not None else None
+
+        frames = []
+        for day in self.dates():
+            if (start and day < start) or (end and day > end):
+                continue
+            path = os.path.join(self._partition_dir(day), 'part-0.parquet')
+            cols = None
+            if columns is not None:
+                names = pq.read_schema(path).names
+                cols = [c for c in columns if c in names]
+            frames.append(pq.read_table(path, columns=cols, memory_map=True).to_pandas())
+
+        if not frames:
+            return pd.DataFrame(columns=columns or [])
+        return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,82 @@
+"""Sensitivity sweep of the Asset Gap and Lottery over RPM x flat fee x production cost.
+
+Every quantity the sidebar assumptions drive has a closed form in them:
+
+* the catalog ``Wealth_Gap`` is ``views * rpm / 1000 - videos * (flat_fee + prod_cost)``;
+* an artist's gap is positive once ``rpm`` exceeds their break-even
+  ``1000 * videos * (flat_fee + prod_cost) / views``;
+* a Lottery video is lost once ``views > 1000 * flat_fee / rpm``.
+
+So :func:`sensitivity_sweep` sorts the per-artist break-even factors and the
+video view counts once, then answers a whole grid with broadcasting and
+``np.searchsorted``; no grid point touches the rows again.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+Sweep = namedtuple('Sweep', [
+    'rpm', 'flat_fee', 'prod_cost',
+    'wealth_gap', 'artists_lost', 'videos_lost', 'videos_won', 'break_even_rpm',
+])
+Sweep.__doc__ = """Sweep results; array axes follow ``(rpm, flat_fee, prod_cost)``.
+
+``wealth_gap`` and ``artists_lost`` (artists whose gap is positive) span all
+three axes. ``videos_lost``/``videos_won`` count Lottery outcomes over
+``(rpm, flat_fee)``. ``break_even_rpm`` is the catalog-wide RPM at which the
+total gap is zero, over ``(flat_fee, prod_cost)``.
+"""
+
+
+def _totals(base):
+    views = base['View Count'].to_numpy(dtype='float64', na_value=0.0)
+    videos = base['Video Title'].to_numpy(dtype='float64')
+    return views, videos
+
+
+def artist_break_even(base, flat_fee, prod_cost):
+    """Copy of :func:`~analytics.aggregates.artist_base_stats` output with ``Break_Even_RPM``.
+
+    Above that RPM going independent beats the flat fees for the artist;
+    artists without views never break even (``inf``).
+    """
+    views, videos = _totals(base)
+    out = base.copy()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out['Break_Even_RPM'] = np.where(views > 0, 1000 * videos * (flat_fee + prod_cost) / views, np.inf)
+    return out.sort_values('Break_Even_RPM', kind='stable', ignore_index=True)
+
+
+def sensitivity_sweep(base, views, rpm, flat_fee, prod_cost, min_views=10000):
+    """Evaluate the Asset Gap and Lottery over the grid ``rpm x flat_fee x prod_cost``.
+
+    ``base`` is :func:`~analytics.aggregates.artist_base_stats` output and
+    ``views`` the per-video ``View Count``; like :func:`analytics.metrics.lottery`,
+    only videos above ``min_views`` enter the Lottery counts.
+    """
+    rpm = np.asarray(rpm, dtype='float64')
+    flat_fee = np.asarray(flat_fee, dtype='float64')
+    prod_cost = np.asarray(prod_cost, dtype='float64')
+    artist_views, artist_videos = _totals(base)
+
+    r = rpm[:, None, None]
+    per_video = flat_fee[None, :, None] + prod_cost[None, None, :]
+    wealth_gap = artist_views.sum() * r / 1000 - artist_videos.sum() * per_video
+
+    # Artist a is lost at (rpm, fee + cost) when 1000 * n_a / v_a < rpm / (fee + cost).
+    with np.errstate(divide='ignore', invalid='ignore'):
+        factor = np.sort(np.where(artist_views > 0, 1000 * artist_videos / artist_views, np.inf))
+        ratio = np.where(per_video > 0, r / per_video, np.inf)
+        break_even_rpm = 1000 * artist_videos.sum() * per_video[0] / artist_views.sum()
+    artists_lost = np.searchsorted(factor, ratio, side='left')
+
+    lottery_views = pd.Series(views).dropna().to_numpy(dtype='float64')
+    lottery_views = np.sort(lottery_views[lottery_views > min_views])
+    with np.errstate(divide='ignore'):
+        threshold = 1000 * flat_fee[None, :] / rpm[:, None]
+    videos_won = np.searchsorted(lottery_views, threshold, side='right')
+    videos_lost = len(lottery_views) - videos_won
+
+    return Sweep(rpm, flat_fee, prod_cost, wealth_gap, artists_lost, videos_lost, videos_won, break_even_rpm)
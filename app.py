@@ -0,0 +1,64 @@
+"""Serve the dashboard with a health probe and a warm-up endpoint.
+
+    streamlit run app.py
+
+* ``GET /healthz`` answers at once: ``200`` with the warm-up summary when the
+  default dataset is cached, ``503`` while it is still loading.
+* ``GET /warmup`` loads the default dataset into the dashboard's caches (see
+  :func:`loaders.warm_default`) and answers once it is ready.
+
+The default dataset is also warmed when the server starts, so a plain HTTP
+ping from ``main.py`` is enough to keep the app hot.
+"""
+
+import asyncio
+import contextlib
+
+import streamlit as st
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from loaders import warm_default
+
+_state = {'status': 'cold'}
+_lock = asyncio.Lock()
+
+
+async def _warm():
+    async with _lock:
+        if _state['status'] != 'ready':
+            _state['status'] = 'warming'
+        try:
+            summary = await asyncio.to_thread(warm_default)
+        except Exception as exc:
+            _state.update(status='error', error=str(exc))
+        else:
+            _state.clear()
+            _state.update(summary, status='ready')
+    return dict(_state)
+
+
+def _response(state):
+    return JSONResponse(state, status_code=200 if state['status'] == 'ready' else 503)
+
+
+async def healthz(request):
+    return _response(dict(_state))
+
+
+async def warmup(request):
+    return _response(await _warm())
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    task = asyncio.create_task(_warm())
+    yield
+    task.cancel()
+
+
+app = st.App(
+    "dashboard.py",
+    routes=[Route("/healthz", healthz), Route("/warmup", warmup)],
+    lifespan=lifespan,
+)
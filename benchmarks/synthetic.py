@@ -0,0 +1,67 @@
+"""Synthetic History Log / Detailed Analytics files with the dashboard's schemas.
+
+View counts are log-normal (a few hits, a long tail) and grow each week by a
+per-video daily rate, so weekly deltas and heatmap medians look like real
+scrapes. A small share of rows hit the exclusion lists on purpose.
+"""
+
+import numpy as np
+import pandas as pd
+
+from analytics.filters import DROP_CHANNELS, EXCLUDED_KEYWORDS
+
+
+def _catalog(n_videos, n_artists, seed):
+    rng = np.random.default_rng(seed)
+    n_artists = n_artists or max(1, n_videos // 25)
+    artist_ids = rng.integers(0, n_artists, n_videos)
+    channels = np.array([f"Channel {i}" for i in range(max(1, n_artists // 4))] + DROP_CHANNELS[:2], dtype=object)
+
+    titles = np.char.add(np.char.add('Song ', np.arange(n_videos).astype(str)), ' (Official Video)').astype(object)
+    flagged = rng.random(n_videos) < 0.02
+    titles[flagged] = [f"{EXCLUDED_KEYWORDS[i % len(EXCLUDED_KEYWORDS)].title()} Song {i}" for i in np.flatnonzero(flagged)]
+
+    released = pd.Timestamp('2026-01-01') - pd.to_timedelta(rng.integers(0, 10 * 365, n_videos), unit='D')
+    released = released + pd.to_timedelta(rng.integers(0, 24, n_videos), unit='h')
+    daily = np.maximum(rng.lognormal(5.0, 1.6, n_videos), 1).round()
+    views = (daily * rng.uniform(200, 900, n_videos)).round()
+
+    return pd.DataFrame({
+        'Video_ID': np.char.add('v', np.arange(n_videos).astype(str)),
+        'Video Title': titles,
+        'Clean_Artist_Name': np.char.add('Artist ', artist_ids.astype(str)),
+        'Channel Name': channels[rng.integers(0, len(channels), n_videos)],
+        'View Count': views.astype('int64'),
+        'Avg_Daily_Views': daily.astype('int64'),
+        'Published At': released,
+    })
+
+
+def make_analytics(n_videos, n_artists=None, seed=0):
+    """One row per video, detected by the loader through ``Clean_Artist_Name``."""
+    catalog = _catalog(n_videos, n_artists, seed)
+    return catalog[['Video Title', 'Clean_Artist_Name', 'Channel Name', 'View Count', 'Avg_Daily_Views', 'Published At']]
+
+
+def make_history(n_videos, n_snapshots, n_artists=None, seed=0, start='2026-01-01'):
+    """``n_videos`` x ``n_snapshots`` weekly scrape rows, detected through ``Date_Scraped``."""
+    catalog = _catalog(n_videos, n_artists, seed)
+    rng = np.random.default_rng(seed + 1)
+    dates = pd.date_range(start, periods=n_snapshots, freq='7D')
+
+    week = np.repeat(np.arange(n_snapshots), n_videos)
+    video = np.tile(np.arange(n_videos), n_snapshots)
+    weekly_gain = catalog['Avg_Daily_Views'].to_numpy()[video] * 7 * rng.uniform(0.6, 1.2, len(video))
+    views = catalog['View Count'].to_numpy()[video] + (weekly_gain * week).round()
+
+    return pd.DataFrame({
+        'Date_Scraped': dates[week].strftime('%Y-%m-%d'),
+        'Video_ID': catalog['Video_ID'].to_numpy()[video],
+        'Video_Title': catalog['Video Title'].to_numpy()[video],
+        'View_Count': views.astype('int64'),
+        'Channel_Name': catalog['Channel Name'].to_numpy()[video],
+    })
+
+
+def to_csv_bytes(df):
+    return df.to_csv(index=False).encode('utf-8')
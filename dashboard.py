@@ -4,9 +4,31 @@ import plotly.express as px
 import plotly.graph_objects as go
 import numpy as np
 
+from analytics.aggregates import LOST_LABEL, WON_LABEL, apply_assumptions
+from analytics.downsample import MAX_SCATTER_POINTS, TOP_K_SERIES, WEBGL_THRESHOLD, decimate_scatter, top_k_series
+from analytics.filters import load_exclusion_filter
+from analytics.forecast import FORECAST_COLUMNS, with_forecasts
+from analytics.ingest import content_key
+from analytics.matching import match_coverage
+from analytics.metrics import (
+    DAY_ORDER, MONTH_ORDER, deal_projection, ghost_income, lottery, monthly_salary,
+    revenue_split, top_artists,
+)
+from analytics.profiling import PROFILE_LOG, StageTimer
+from analytics.simulation import N_SCENARIOS, simulate_deal, simulate_deals
+from analytics.sweep import artist_break_even, sensitivity_sweep
+from loaders import (
+    DEFAULT_STORE_WEEKS, artist_base, artist_frames, decay_fits, growth_index,
+    ingest_uploads, read_store, store, timing_cube,
+)
+
 # --- PAGE CONFIG ---
 st.set_page_config(page_title="Music Money Analytics", layout="wide")
 
+# The diagnostics toggle is drawn at the bottom of the sidebar; its state from
+# the previous interaction decides whether this rerun is timed.
+timer = StageTimer(enabled=st.session_state.get("profile_stages", False))
+
 st.title("🎵 Artist vs. Channel Wealth Dashboard")
 st.markdown("""
 This tool simulates the financial reality of the music industry.  
@@ -23,6 +45,12 @@ uploaded_files = st.sidebar.file_uploader(
     accept_multiple_files=True
 )
 
+stored_dates = store.dates()
+save_to_store = st.sidebar.checkbox("Save History Log to local store", value=False, help=f"Appends new weekly snapshots to '{store.root}' so you don't have to re-upload them next time.")
+store_weeks = 0
+if stored_dates:
+    store_weeks = st.sidebar.slider("Weeks of stored history to load", min_value=2 if len(stored_dates) > 1 else 1, max_value=len(stored_dates), value=min(len(stored_dates), DEFAULT_STORE_WEEKS), help="Used when no History Log is uploaded. Only the selected weeks are read from disk.")
+
 st.sidebar.markdown("---")
 st.sidebar.header("2. Global Assumptions")
 rpm = st.sidebar.slider("RPM ($ per 1k views)", 0.5, 10.0, 4.0, 0.1, help="Revenue Per Mille: How much YouTube pays for every 1,000 views.")
@@ -41,92 +69,82 @@ ghost_years = st.sidebar.slider("Years until 'Old'",
                                 help="Videos older than this number of years are considered 'Ghost Income' sources.")
 ghost_days = ghost_years * 365 
 
-# --- CONFIG: EXCLUSION LISTS ---
-EXCLUDED_KEYWORDS = ['ethiopian', 'ethiopia', 'amharic', 'oromo', 'tigray', 'wolayta', 'hope music']
-DROP_CHANNELS = [
-    'Liham Melody', 'Hope Music Ethiopia', 'Minew Shewa Tube',
-    'Fana Television', 'EBS TV', 'Propictures', 'Merih Media', 
-    'Cinemax Entertainment', 'Habesha Music', 'ADMAS MUSIC'
-]
-
 # --- INTELLIGENT DATA LOADER ---
-if not uploaded_files:
+if not uploaded_files and not stored_dates:
     st.warning("👈 Please upload your CSV file(s) in the sidebar to begin.")
     st.stop()
 
-# Placeholders
-df_static = pd.DataFrame()
-df_history = pd.DataFrame()
-artist_map = {}
-
-for file in uploaded_files:
-    try:
-        temp_df = pd.read_csv(file, on_bad_lines='skip')
-    except:
-        file.seek(0)
-        temp_df = pd.read_csv(file)
-    
-    cols = temp_df.columns.tolist()
-    
-    if 'Date_Scraped' in cols:
-        # === HISTORY LOG ===
-        df_history = temp_df.copy()
-        df_history['Date_Scraped'] = pd.to_datetime(df_history['Date_Scraped'], errors='coerce')
-        df_history = df_history.dropna(subset=['Date_Scraped'])
-        df_history = df_history.rename(columns={
-            'Video_Title': 'Video Title', 'View_Count': 'View Count', 'Channel_Name': 'Channel Name'
-        })
-        
-        if 'Channel Name' in df_history.columns:
-            df_history = df_history[~df_history['Channel Name'].isin(DROP_CHANNELS)]
-            
-        def is_clean_content(title):
-            if not isinstance(title, str): return True
-            t_lower = title.lower()
-            for k in EXCLUDED_KEYWORDS:
-                if k in t_lower: return False
-            return True
-
-        df_history = df_history[df_history['Video Title'].apply(is_clean_content)]
-        st.sidebar.success(f"✅ Loaded History Log ({len(df_history)} rows)")
-        
-    elif 'Clean_Artist_Name' in cols:
-        # === DETAILED ANALYSIS ===
-        df_static = temp_df.copy()
-        artist_map = df_static.drop_duplicates('Video Title').set_index('Video Title')['Clean_Artist_Name'].to_dict()
-        st.sidebar.success(f"✅ Loaded Artist Analysis ({len(df_static)} rows)")
+# The loaders are cached per dataset in loaders.py and shared across reruns
+# and sessions: never mutate the frames they return in place.
+exclusions = load_exclusion_filter()
+upload_files = [(f.name, f.getvalue()) for f in uploaded_files or []]
+upload_key = content_key(upload_files)
+with timer.stage("ingest uploads") as stage:
+    df_history, df_static, artist_map, ingest_stats = ingest_uploads(upload_key, exclusions.key, upload_files, exclusions)
+    stage.rows = len(df_history) + len(df_static)
+history_key = growth_key = (upload_key, exclusions.key)
 
-# Merge Logic
 if not df_history.empty:
-    if artist_map:
-        df_history['Clean_Artist_Name'] = df_history['Video Title'].map(artist_map)
-        df_history['Is_Identified'] = df_history['Clean_Artist_Name'].notna()
-        df_history['Clean_Artist_Name'] = df_history['Clean_Artist_Name'].fillna(df_history['Channel Name'])
-    elif 'Clean_Artist_Name' not in df_history.columns:
-        df_history['Clean_Artist_Name'] = df_history.get('Channel Name', 'Unknown')
-        df_history['Is_Identified'] = False
-else:
-    df_history['Is_Identified'] = False
+    if len(ingest_stats) > 1:
+        st.sidebar.success(f"✅ Merged {len(ingest_stats)} History Logs ({len(df_history)} rows)")
+    else:
+        st.sidebar.success(f"✅ Loaded History Log ({len(df_history)} rows)")
+    duplicates = sum(s['duplicates'] for s in ingest_stats.values())
+    if duplicates:
+        st.sidebar.caption(f"Dropped {duplicates:,} repeated video/scrape-date row(s) across logs")
+    bad_lines = sum(s['bad_lines'] for s in ingest_stats.values())
+    if bad_lines:
+        st.sidebar.warning(f"⚠️ Skipped {bad_lines:,} malformed line(s) in the History Log")
+    bad_views = sum(s['bad_views'] for s in ingest_stats.values())
+    if bad_views:
+        st.sidebar.warning(f"⚠️ {bad_views:,} View Count cell(s) were not numbers and were left blank")
+    # Appending groups the whole history by date, so do it once per upload
+    # rather than on every rerun.
+    if save_to_store and st.session_state.get("stored_history_key") != history_key:
+        written = store.append(df_history)
+        st.session_state["stored_history_key"] = history_key
+        if written:
+            st.sidebar.success(f"💾 Saved {len(written)} new snapshot(s) to the store")
+elif stored_dates:
+    start = stored_dates[-store_weeks]
+    store_version = store.version()
+    with timer.stage("read history store") as stage:
+        df_history = read_store(store_version, start, upload_key, exclusions.key, artist_map, exclusions)
+        stage.rows = len(df_history)
+    # The growth index leaves the store version out on purpose: new weeks
+    # extend the cached index. Every other cache is rebuilt per version.
+    growth_key = ('store', start, upload_key, exclusions.key)
+    history_key = growth_key + (store_version,)
+    st.sidebar.success(f"✅ Loaded History Store ({len(df_history)} rows since {start})")
+if not df_static.empty:
+    st.sidebar.success(f"✅ Loaded Artist Analysis ({len(df_static)} rows)")
+if 'Match_Method' in df_history.columns:
+    coverage = match_coverage(df_history['Match_Method'])
+    st.sidebar.caption(
+        f"🔗 Identified {1 - coverage['unmatched']:.1%} of history rows: "
+        + ", ".join(f"{method} {share:.1%}" for method, share in coverage.drop('unmatched').items())
+    )
+
+with timer.stage("weekly growth index") as stage:
+    growth = growth_index(growth_key, df_history)
+    growth.extend(df_history)
+    stage.rows = len(growth.dates)
+
+with timer.stage("view decay fit") as stage:
+    fits = decay_fits(history_key, df_history)
+    stage.rows = len(fits)
 
 # Primary Selection
-if not df_static.empty:
-    df = df_static.copy()
-elif not df_history.empty:
-    latest_date = df_history['Date_Scraped'].max()
-    df = df_history[df_history['Date_Scraped'] == latest_date].copy()
-else:
+# Both frames are sorted by a shared artist code once per dataset, so the
+# artist filters and per-artist lookups below are positional slices.
+with timer.stage("primary selection") as stage:
+    grouped = artist_frames(history_key, df_static, df_history)
+    stage.rows = len(grouped[0].frame) if grouped is not None else 0
+if grouped is None:
     st.error("Could not process files.")
     st.stop()
-
-# Smart Column Mapper
-possible_date_cols = ['Published At', 'publishedAt', 'Release Date', 'release_date']
-for col in possible_date_cols:
-    if col in df.columns:
-        df = df.rename(columns={col: 'Video Release Date'})
-        break
-
-if 'Clean_Artist_Name' not in df.columns:
-     df['Clean_Artist_Name'] = df.get('Channel Name', 'Unknown')
+df_groups, history_groups = grouped
+df = df_groups.frame
 
 # --- ARTIST FILTER ---
 st.sidebar.markdown("---")
@@ -134,55 +152,81 @@ st.sidebar.header("5. Filter Data")
 
 hide_unidentified = st.sidebar.checkbox("Hide Unidentified (Channels)", value=False, help="Hides rows where we couldn't find a specific Artist Name.")
 
-all_artists = sorted(df['Clean_Artist_Name'].unique().astype(str))
+all_artists = df_groups.present_names()
 selected_artists = st.sidebar.multiselect("Include Specific Artist(s):", options=all_artists, default=None)
 excluded_artists = []
 if not selected_artists:
     excluded_artists = st.sidebar.multiselect("Exclude Specific Artist(s):", options=all_artists, default=None)
 
 # Apply Filters
-if hide_unidentified and 'Is_Identified' in df_history.columns:
-    df_history = df_history[df_history['Is_Identified'] == True]
+def artist_rows(groups, artist):
+    if (selected_artists and artist not in selected_artists) or artist in excluded_artists:
+        return groups.frame.iloc[0:0]
+    return groups.artist(artist)
+
+def apply_artist_filter(frame):
+    if selected_artists:
+        return frame[frame['Clean_Artist_Name'].isin(selected_artists)]
+    if excluded_artists:
+        return frame[~frame['Clean_Artist_Name'].isin(excluded_artists)]
+    return frame
+
+with timer.stage("artist filters") as stage:
+    if selected_artists:
+        df = df_groups.select(selected_artists)
+        df_history = history_groups.select(selected_artists)
+    elif excluded_artists:
+        df = df_groups.exclude(excluded_artists)
+        df_history = history_groups.exclude(excluded_artists)
+    else:
+        df_history = history_groups.frame
+    
+    if hide_unidentified and 'Is_Identified' in df_history.columns:
+        df_history = df_history[df_history['Is_Identified'] == True]
+    stage.rows = len(df) + len(df_history)
 
 if selected_artists:
-    df = df[df['Clean_Artist_Name'].isin(selected_artists)]
-    if not df_history.empty:
-        df_history = df_history[df_history['Clean_Artist_Name'].isin(selected_artists)]
     st.sidebar.success(f"Showing {len(selected_artists)} selected artist(s).")
 elif excluded_artists:
-    df = df[~df['Clean_Artist_Name'].isin(excluded_artists)]
-    if not df_history.empty:
-        df_history = df_history[~df_history['Clean_Artist_Name'].isin(excluded_artists)]
     st.sidebar.info(f"Showing ALL artists except {len(excluded_artists)} excluded.")
 else:
     st.sidebar.info("Showing ALL artists.")
 
 # --- CALCULATIONS ---
-df['Actual_Revenue'] = (df['View Count'] / 1000) * rpm
-df['Outcome'] = df['Actual_Revenue'].apply(lambda x: 'Artist Lost Money (Hit Song)' if x > flat_fee else 'Artist Won (Safe)')
-
-artist_stats = df.groupby('Clean_Artist_Name').agg({
-    'View Count': 'sum', 'Video Title': 'count', 'Actual_Revenue': 'sum'
-}).reset_index()
-
-artist_stats['Est_Fees_Received'] = artist_stats['Video Title'] * flat_fee
-artist_stats['Total_Prod_Cost'] = artist_stats['Video Title'] * prod_cost
-artist_stats['Net_Independent_Profit'] = artist_stats['Actual_Revenue'] - artist_stats['Total_Prod_Cost']
-artist_stats['Wealth_Gap'] = artist_stats['Net_Independent_Profit'] - artist_stats['Est_Fees_Received']
+# View and video totals only change with the data or the artist filters; the
+# money columns are rescaled from them on every slider move.
+filter_key = (tuple(selected_artists), tuple(excluded_artists))
+data_key = (history_key, filter_key, hide_unidentified)
+with timer.stage("artist aggregation") as stage:
+    artist_stats = apply_assumptions(artist_base(history_key, filter_key, df), rpm, flat_fee, prod_cost)
+    stage.rows = len(artist_stats)
 
 # --- TABS ---
-tabs = st.tabs([
-    "📊 The Asset Gap", 
-    "🎟️ The Lottery Ticket", 
-    "👻 Ghost Income", 
-    "🔮 Deal Simulator", 
-    "📈 Weekly Pitch", 
-    "📅 Monthly Salary", 
-    "🔥 Perfect Timing"
-])
+# Each tab is a render function so that, in lazy mode, only the open tab runs.
+# Tab data and figures only depend on the dataset, the filters and the
+# parameters in their key, so switching back to a tab reuses them.
+@st.cache_resource(max_entries=64, show_spinner=False)
+def tab_memo(key, _compute):
+    return _compute()
+
+# Streamlit forgets the state of widgets that are not drawn in a run, and
+# lazy mode skips every closed tab. Tab inputs therefore keep their value
+# under a plain session key, which is restored before the widget is drawn.
+def _keep(key):
+    st.session_state[f"kept_{key}"] = st.session_state[key]
+
+def kept(key, default=None, options=None):
+    value = st.session_state.get(f"kept_{key}", default)
+    if value is None or (options is not None and value not in options):
+        st.session_state.pop(key, None)
+        st.session_state.pop(f"kept_{key}", None)
+        value = default
+    if value is not None:
+        st.session_state[key] = value
+    return {'key': key, 'on_change': _keep, 'args': (key,)}
 
 # === TAB 1: ASSET GAP ===
-with tabs[0]:
+def render_asset_gap():
     st.header("Who owns the wealth?")
     with st.expander("ℹ️ How is this calculated?"):
         st.markdown(f"""
@@ -201,11 +245,15 @@ with tabs[0]:
         * Formula: `Independent Net Profit - Flat Fees Received`
         """)
 
-    top_artists = artist_stats.sort_values('Actual_Revenue', ascending=False).head(15)
-    fig_gap = go.Figure()
-    fig_gap.add_trace(go.Bar(y=top_artists['Clean_Artist_Name'], x=top_artists['Net_Independent_Profit'], name='Potential Net Profit', orientation='h', marker_color='#EF553B'))
-    fig_gap.add_trace(go.Bar(y=top_artists['Clean_Artist_Name'], x=top_artists['Est_Fees_Received'], name='Actual Fees Received', orientation='h', marker_color='#00CC96'))
-    fig_gap.update_layout(barmode='overlay', title="The Asset Gap", height=600, legend=dict(orientation="h", y=1.02, x=0.3))
+    def gap_figure():
+        top_gap = top_artists(artist_stats)
+        fig_gap = go.Figure()
+        fig_gap.add_trace(go.Bar(y=top_gap['Clean_Artist_Name'], x=top_gap['Net_Independent_Profit'], name='Potential Net Profit', orientation='h', marker_color='#EF553B'))
+        fig_gap.add_trace(go.Bar(y=top_gap['Clean_Artist_Name'], x=top_gap['Est_Fees_Received'], name='Actual Fees Received', orientation='h', marker_color='#00CC96'))
+        fig_gap.update_layout(barmode='overlay', title="The Asset Gap", height=600, legend=dict(orientation="h", y=1.02, x=0.3))
+        return fig_gap
+
+    fig_gap = tab_memo(("asset gap", data_key, rpm, flat_fee, prod_cost), gap_figure)
     st.plotly_chart(fig_gap, use_container_width=True)
     
     gap = artist_stats['Wealth_Gap'].sum()
@@ -217,7 +265,7 @@ with tabs[0]:
         st.write("Interpretation: The artists **won** this deal. They collected more in fees than the videos earned.")
 
 # === TAB 2: LOTTERY ===
-with tabs[1]:
+def render_lottery():
     st.header("Did selling for a Flat Fee pay off?")
     with st.expander("ℹ️ How is this calculated?"):
         st.markdown(f"""
@@ -231,19 +279,30 @@ with tabs[1]:
         🟢 **Green Dot (Artist Won):** The video earned LESS than ${flat_fee}. The artist made a smart choice selling it.
         """)
 
-    df_chart = df[df['View Count'] > 10000].copy()
-    if not df_chart.empty and 'Video Release Date' in df_chart.columns:
-        fig_scatter = px.scatter(df_chart, x='Video Release Date', y='Actual_Revenue', color='Outcome', 
+    def lottery_figure():
+        df_chart = lottery(df, rpm, flat_fee)
+        if df_chart.empty or 'Video Release Date' not in df_chart.columns:
+            return None, 0, 0
+        # Cap the points sent to the browser; LTTB keeps the hits visible.
+        df_plot = decimate_scatter(df_chart, 'Video Release Date', 'Actual_Revenue', MAX_SCATTER_POINTS, group='Outcome')
+        fig_scatter = px.scatter(df_plot, x='Video Release Date', y='Actual_Revenue', color='Outcome', 
                                hover_data=['Video Title', 'Clean_Artist_Name'], 
-                               color_discrete_map={'Artist Lost Money (Hit Song)': '#EF553B', 'Artist Won (Safe)': '#00CC96'}, 
-                               title="Revenue per Video vs. Release Date")
+                               color_discrete_map={LOST_LABEL: '#EF553B', WON_LABEL: '#00CC96'}, 
+                               title="Revenue per Video vs. Release Date",
+                               render_mode='webgl' if len(df_plot) > WEBGL_THRESHOLD else 'auto')
         fig_scatter.add_hline(y=flat_fee, line_dash="dash", annotation_text=f"Flat Fee (${flat_fee})")
+        return fig_scatter, len(df_plot), len(df_chart)
+
+    fig_scatter, shown, total = tab_memo(("lottery", data_key, rpm, flat_fee), lottery_figure)
+    if fig_scatter is not None:
         st.plotly_chart(fig_scatter, use_container_width=True)
+        if shown < total:
+            st.caption(f"Showing {shown:,} of {total:,} videos (downsampled to keep the chart responsive).")
     else:
         st.info("Scatter plot requires 'Video Release Date' or 'Published At'.")
 
 # === TAB 3: GHOST INCOME ===
-with tabs[2]:
+def render_ghost_income():
     st.header(f"👻 Ghost Income (Videos > {ghost_years} Years Old)")
     with st.expander("ℹ️ How is this calculated?"):
         st.markdown(f"""
@@ -255,27 +314,29 @@ with tabs[2]:
         * Video must be getting significant daily views (>100).
         
         **2. The Calculation:**
-        * `Daily Views * 365 Days * (${rpm} RPM / 1000)`
+        * `Views over the next 365 Days * (${rpm} RPM / 1000)`
+        * When a History Log is loaded, next year's views follow each video's own decay curve fitted from the weekly snapshots; otherwise `Daily Views * 365` is used.
         """)
 
     if 'Video Release Date' in df.columns and 'Avg_Daily_Views' in df.columns:
-        # Calculate Age
-        df['Video Release Date'] = pd.to_datetime(df['Video Release Date'])
-        df['Days_Since_Release'] = (pd.Timestamp.now() - df['Video Release Date']).dt.days
-        
-        old_gold = df[(df['Days_Since_Release'] > ghost_days) & (df['Avg_Daily_Views'] > 100)].copy()
-        if not old_gold.empty:
-            old_gold['Est_Annual_Passive'] = (old_gold['Avg_Daily_Views'] * 365 / 1000) * rpm
-            fig_ghost = px.bar(old_gold.sort_values('Est_Annual_Passive', ascending=False).head(15), x='Est_Annual_Passive', y='Video Title', color='Clean_Artist_Name', orientation='h')
+        def ghost_figure():
+            old_gold = ghost_income(with_forecasts(df, fits, now=pd.Timestamp.now()), rpm, ghost_days)
+            if old_gold.empty:
+                return None, 0.0
+            fig_ghost = px.bar(old_gold.head(15), x='Est_Annual_Passive', y='Video Title', color='Clean_Artist_Name', orientation='h')
+            return fig_ghost, old_gold['Est_Annual_Passive'].sum()
+
+        fig_ghost, total_passive = tab_memo(("ghost income", data_key, rpm, ghost_days, pd.Timestamp.now().date()), ghost_figure)
+        if fig_ghost is not None:
             st.plotly_chart(fig_ghost, use_container_width=True)
-            st.success(f"💰 Total Passive Income: **${old_gold['Est_Annual_Passive'].sum():,.0f} / year**")
+            st.success(f"💰 Total Passive Income: **${total_passive:,.0f} / year**")
         else:
             st.warning("No videos fit the Ghost Income criteria.")
     else:
         st.warning("Missing data for Ghost Income. Use the Detailed Analysis file.")
 
 # === TAB 4: DEAL SIMULATOR ===
-with tabs[3]:
+def render_deal_simulator():
     st.header("🔮 Should I sign this contract?")
     with st.expander("ℹ️ How does this work?"):
         st.markdown(f"""
@@ -289,15 +350,19 @@ with tabs[3]:
         **2. The Comparison:**
         * **Scenario A (Sign):** You get the Flat Fee cash guaranteed.
         * **Scenario B (Independent):** You get the Projected Revenue minus your Production Cost.
+        
+        **3. Monte Carlo mode:**
+        * Each scenario picks one of the artist's past view counts at random and an RPM within your range.
+        * The chance the deal loses money is the share of scenarios where going independent beats the flat fee.
         """)
 
     c1, c2 = st.columns(2)
-    offer = c1.number_input("They are offering (Flat Fee):", value=5000, step=500)
-    cost = c1.number_input("My Production Cost:", value=2500, step=500)
-    target = c2.selectbox("Select Artist:", options=all_artists)
+    offer = c1.number_input("They are offering (Flat Fee):", step=500, **kept("deal_offer", 5000))
+    cost = c1.number_input("My Production Cost:", step=500, **kept("deal_cost", 2500))
+    target = c2.selectbox("Select Artist:", options=all_artists, **kept("deal_artist", options=all_artists))
     
     st.markdown("---")
-    t_data = df[df['Clean_Artist_Name'] == target].copy()
+    t_data = artist_rows(df_groups, target)
     if not t_data.empty:
         d_data = t_data[['Video Title', 'View Count']].copy()
         d_data.insert(0, "Include", True)
@@ -306,27 +371,51 @@ with tabs[3]:
         clean = t_data[t_data['Video Title'].isin(sel)]
         
         if not clean.empty:
-            med_views = clean['View Count'].median()
-            rev = (med_views / 1000) * rpm
-            prof = rev - cost
+            deal = deal_projection(clean['View Count'], rpm, cost, offer)
             
             x1, x2 = st.columns(2)
             x1.info(f"📝 Deal: **${offer:,.0f}** guaranteed")
-            x2.metric("🚀 Independent Net Profit", f"${prof:,.0f}", delta=f"{prof - offer:,.0f}")
+            x2.metric("🚀 Independent Net Profit", f"${deal.profit:,.0f}", delta=f"{deal.diff:,.0f}")
             
-            diff = prof - offer
-            if diff > 1000: st.error("❌ **REJECT.** You make more money alone.")
-            elif diff < -1000: st.success("✅ **TAKE IT.** Good deal.")
+            if deal.verdict == 'reject': st.error("❌ **REJECT.** You make more money alone.")
+            elif deal.verdict == 'take': st.success("✅ **TAKE IT.** Good deal.")
             else: st.warning("⚠️ **TOSSUP.** Fair deal.")
 
+    st.markdown("---")
+    if st.checkbox("🎲 Monte Carlo mode", **kept("deal_monte_carlo", False), help="Simulate thousands of releases by drawing view counts from the artist's past videos and an RPM from a range."):
+        m1, m2 = st.columns(2)
+        rpm_range = m1.slider("RPM range ($ per 1k views)", 0.5, 10.0, step=0.1, **kept("deal_rpm_range", (max(0.5, round(rpm * 0.5, 1)), min(10.0, round(rpm * 1.5, 1)))))
+        n_scenarios = m2.select_slider("Scenarios", options=[1_000, 5_000, 10_000, 50_000], **kept("deal_scenarios", N_SCENARIOS))
+
+        if not t_data.empty and not clean.empty:
+            sim = simulate_deal(clean['View Count'], rpm_range, cost, offer, n=n_scenarios, seed=0)
+            y1, y2, y3 = st.columns(3)
+            y1.metric("Chance the deal loses money", f"{sim.p_loss:.0%}", help="Share of scenarios where going independent nets more than the flat fee.")
+            y2.metric("Chance independent loses money", f"{sim.p_negative:.0%}")
+            y3.metric("Average independent profit", f"${sim.mean_profit:,.0f}")
+            bands = pd.DataFrame({'Percentile': [f"P{q}" for q in sim.bands.index], 'Independent Net Profit': sim.bands.to_numpy()})
+            fig_bands = px.bar(bands, x='Percentile', y='Independent Net Profit', title=f"Independent profit bands for {target}")
+            fig_bands.add_hline(y=offer, line_dash="dash", annotation_text="Flat fee offer")
+            st.plotly_chart(fig_bands, use_container_width=True)
+
+        if st.checkbox("Rank every artist", **kept("deal_rank_all", False), help="Runs the same simulation for all artists at once (all of their videos)."):
+            ranking = tab_memo(
+                ("deal ranking", history_key, rpm_range, cost, offer, n_scenarios),
+                lambda: simulate_deals(df_groups.frame, rpm_range, cost, offer, n=n_scenarios, seed=0),
+            )
+            st.dataframe(ranking, hide_index=True, use_container_width=True, column_config={
+                'P_Loss': st.column_config.ProgressColumn("Chance deal loses", format="%.2f", min_value=0, max_value=1),
+                'P_Negative': st.column_config.ProgressColumn("Chance independent loses", format="%.2f", min_value=0, max_value=1),
+            })
+
 # === TAB 5: WEEKLY PITCH ===
-with tabs[4]:
+def render_weekly_pitch():
     if not df_history.empty:
         st.header("📈 The Weekly Pulse (Your Pitch Tool)")
         with st.expander("ℹ️ How is this calculated?"):
              st.markdown(f"""
              **The Logic:**
-             This tab calculates the growth between your two most recent history logs to show *current* velocity.
+             This tab calculates the growth between two history logs (by default your two most recent) to show *current* velocity.
              
              **1. Revenue Calculation:**
              * `Views Gained This Week / 1000 * ${rpm} RPM`
@@ -335,20 +424,38 @@ with tabs[4]:
              * We calculate your cut based on the **{platform_cut}%** fee set in the Sidebar.
              * **Artist Keeps:** {artist_cut_pct}% of the revenue.
              * **Platform Keeps:** {platform_cut}% of the revenue.
+             
+             **3. Anomalies:**
+             * Each video's weekly gain is compared with its own running average. Falling view counts, and gains far above or below the usual, are flagged.
+             * Tick **Exclude flagged anomalies** to leave them out of the revenue numbers and the velocity chart.
              """)
 
-        dates = sorted(df_history['Date_Scraped'].unique())
+        history_start = df_history['Date_Scraped'].min()
+        dates = [d for d in growth.dates if d >= history_start]
         if len(dates) < 2:
             st.warning("⚠️ Need at least 2 weekly logs to calculate growth.")
         else:
-            latest, prev = dates[-1], dates[-2]
-            idx = 'Video_ID' if 'Video_ID' in df_history.columns else 'Video Title'
+            w1, w2 = st.columns(2)
+            latest = w2.selectbox("Compare snapshot:", options=dates[1:][::-1], **kept("pitch_latest", options=dates[1:]), format_func=lambda d: d.strftime('%b %d, %Y'))
+            earlier = [d for d in dates if d < latest]
+            prev = w1.selectbox("Against snapshot:", options=earlier[::-1], **kept("pitch_prev", options=earlier), format_func=lambda d: d.strftime('%b %d, %Y'))
             
-            df_latest = df_history[df_history['Date_Scraped'] == latest].drop_duplicates(idx).set_index(idx)
-            df_prev = df_history[df_history['Date_Scraped'] == prev].drop_duplicates(idx).set_index(idx)
+            df_growth = growth.video_growth(prev, latest)
+            if hide_unidentified and 'Is_Identified' in df_growth.columns:
+                df_growth = df_growth[df_growth['Is_Identified'] == True]
+            df_growth = apply_artist_filter(df_growth)
             
-            df_growth = df_latest.join(df_prev, lsuffix='_now', rsuffix='_prev')
-            df_growth['Views_Gained'] = df_growth['View Count_now'] - df_growth['View Count_prev']
+            flagged = df_growth[df_growth['Anomaly'].notna()]
+            exclude_anomalies = st.checkbox("Exclude flagged anomalies", **kept("pitch_exclude_anomalies", False), help="Leaves out view-count drops, deleted videos and unusual spikes.")
+            if not flagged.empty:
+                counts = flagged['Anomaly'].value_counts()
+                with st.expander(f"⚠️ {len(flagged):,} video(s) flagged: " + ", ".join(f"{n} {kind}" for kind, n in counts.items() if n)):
+                    st.dataframe(
+                        flagged[['Video Title', 'Clean_Artist_Name', 'View Count_prev', 'View Count_now', 'Views_Gained', 'Anomaly']].sort_values('Views_Gained', key=abs, ascending=False),
+                        hide_index=True, use_container_width=True,
+                    )
+            if exclude_anomalies:
+                df_growth = df_growth[df_growth['Anomaly'].isna()]
             
             # Metrics
             gained = df_growth['Views_Gained'].sum()
@@ -374,8 +481,7 @@ with tabs[4]:
             p1.markdown(f"* You earned: **$0.00** this week.\n* Channel Owner kept: **${rev_week:,.2f}**")
             
             # New
-            my_cut_amt = rev_week * (platform_cut / 100.0)
-            artist_cut_amt = rev_week * (artist_cut_pct / 100.0)
+            artist_cut_amt, my_cut_amt = revenue_split(rev_week, platform_cut)
             
             p2.success(f"✅ With Us ({artist_cut_pct}/{platform_cut} Split)")
             p2.markdown(f"""
@@ -387,28 +493,42 @@ with tabs[4]:
             
             # Growth Charts
             st.subheader("🔥 Top Performing Videos (Last Week)")
-            df_growth['Week_Revenue'] = (df_growth['Views_Gained'] / 1000) * rpm
-            top = df_growth.sort_values('Views_Gained', ascending=False).head(10)
-            if not top.empty:
-                fig = px.bar(top, x='Week_Revenue', y='Video Title_now' if 'Video Title_now' in top.columns else top.index, orientation='h', text_auto='$.2f')
+            def top_videos_figure():
+                top = df_growth.sort_values('Views_Gained', ascending=False).head(10).copy()
+                top['Week_Revenue'] = (top['Views_Gained'] / 1000) * rpm
+                if top.empty:
+                    return None
+                return px.bar(top, x='Week_Revenue', y='Video Title' if 'Video Title' in top.columns else top.index, orientation='h', text_auto='$.2f')
+
+            fig = tab_memo(("top videos", data_key, prev, latest, rpm, exclude_anomalies), top_videos_figure)
+            if fig is not None:
                 st.plotly_chart(fig, use_container_width=True)
             
             # Velocity
             st.subheader("📈 Velocity: Views Gained Over Time")
-            daily_agg = df_history.groupby(['Date_Scraped', 'Clean_Artist_Name'])['View Count'].sum().reset_index()
-            daily_agg = daily_agg.sort_values('Date_Scraped')
-            daily_agg['Previous_Views'] = daily_agg.groupby('Clean_Artist_Name')['View Count'].shift(1)
-            daily_agg['New_Views'] = daily_agg['View Count'] - daily_agg['Previous_Views']
-            
-            velocity_data = daily_agg.dropna(subset=['New_Views'])
-            if not velocity_data.empty:
-                fig_vel = px.line(velocity_data, x='Date_Scraped', y='New_Views', color='Clean_Artist_Name', markers=True, title="Growth Velocity (New Views per Week)")
+            def velocity_figure():
+                daily_agg = apply_artist_filter(growth.artist_velocity())
+                daily_agg = daily_agg[daily_agg['Date_Scraped'] > history_start]
+                if hide_unidentified and 'Is_Identified' in df_history.columns:
+                    daily_agg = daily_agg[daily_agg['Clean_Artist_Name'].isin(df_history['Clean_Artist_Name'].unique())]
+                
+                if exclude_anomalies:
+                    daily_agg = daily_agg.assign(New_Views=daily_agg['New_Views'] - daily_agg['Flagged_Views'])
+                velocity_data = daily_agg.dropna(subset=['New_Views'])
+                if velocity_data.empty:
+                    return None
+                # One line per artist does not scale; keep the biggest movers and bucket the rest.
+                velocity_data = top_k_series(velocity_data, 'Clean_Artist_Name', 'Date_Scraped', 'New_Views', TOP_K_SERIES)
+                return px.line(velocity_data, x='Date_Scraped', y='New_Views', color='Clean_Artist_Name', markers=True, title="Growth Velocity (New Views per Week)")
+
+            fig_vel = tab_memo(("velocity", data_key, history_start, len(growth.dates), exclude_anomalies), velocity_figure)
+            if fig_vel is not None:
                 st.plotly_chart(fig_vel, use_container_width=True)
     else:
         st.warning("Please upload a History Log file to see Weekly Cashflow.")
 
 # === TAB 6: MONTHLY SALARY SIM ===
-with tabs[5]:
+def render_monthly_salary():
     st.header("📅 Monthly Salary Simulator")
     st.markdown("##### The Argument: *'Here is the paycheck you missed.'*")
     
@@ -418,35 +538,30 @@ with tabs[5]:
         We simulate a monthly paycheck based on the artist's last 5 videos.
         
         **1. Gross Revenue:**
-        * `Daily Views * 30 Days * (${rpm} RPM / 1000)`
+        * `Views over the next 30 Days * (${rpm} RPM / 1000)`
+        * Next month's views follow each video's fitted decay curve when a History Log is loaded, otherwise `Daily Views * 30`.
         
         **2. The Deduction (Platform Fee):**
         * We automatically deduct your **{platform_cut}%** platform fee set in the Sidebar.
         * **Net Pay:** What the artist actually takes home.
         """)
 
-    salary_artist = st.selectbox("Select Artist for Payroll:", options=all_artists, key="salary_artist")
+    salary_artist = st.selectbox("Select Artist for Payroll:", options=all_artists, **kept("salary_artist", options=all_artists))
     
-    s_data = df[df['Clean_Artist_Name'] == salary_artist].copy()
+    s_data = artist_rows(df_groups, salary_artist)
     
     if not s_data.empty and 'Video Release Date' in s_data.columns:
-        s_data['Video Release Date'] = pd.to_datetime(s_data['Video Release Date'])
-        recent_videos = s_data.sort_values('Video Release Date', ascending=False).head(5)
-        
-        if not recent_videos.empty and 'Avg_Daily_Views' in recent_videos.columns:
-            # 1. Gross Revenue
-            recent_videos['Gross_Monthly'] = (recent_videos['Avg_Daily_Views'] * 30 / 1000) * rpm
-            
-            # 2. Apply Platform Cut (From Sidebar)
-            recent_videos['Net_Monthly_Pay'] = recent_videos['Gross_Monthly'] * (artist_cut_pct / 100.0)
+        if 'Avg_Daily_Views' in s_data.columns:
+            recent_videos = monthly_salary(with_forecasts(s_data, fits, now=pd.Timestamp.now()), rpm, artist_cut_pct)
             
             st.subheader(f"Projected Monthly Checks for {salary_artist}")
             st.caption(f"Calculated using a **{artist_cut_pct}% Split** (You keep {artist_cut_pct}%).")
             
-            pay_stub = recent_videos[['Video Title', 'Video Release Date', 'Avg_Daily_Views', 'Net_Monthly_Pay']].copy()
+            forecast_col = FORECAST_COLUMNS[30]
+            pay_stub = recent_videos[['Video Title', 'Video Release Date', 'Avg_Daily_Views', forecast_col, 'Net_Monthly_Pay']].copy()
             pay_stub['Video Release Date'] = pay_stub['Video Release Date'].dt.date
             
-            st.dataframe(pay_stub.style.format({'Net_Monthly_Pay': '${:,.2f}', 'Avg_Daily_Views': '{:,.0f}'}), use_container_width=True)
+            st.dataframe(pay_stub.style.format({'Net_Monthly_Pay': '${:,.2f}', 'Avg_Daily_Views': '{:,.0f}', forecast_col: '{:,.0f}'}, na_rep='-'), use_container_width=True)
             
             total_monthly = pay_stub['Net_Monthly_Pay'].sum()
             annual_salary = total_monthly * 12
@@ -462,7 +577,7 @@ with tabs[5]:
         st.warning("Need 'Video Release Date' column. Upload Detailed Analytics file.")
 
 # === TAB 7: HEATMAP ===
-with tabs[6]:
+def render_heatmap():
     st.header("🔥 The 'Perfect Timing' Heatmap")
     with st.expander("ℹ️ How does this work?"):
         st.markdown("""
@@ -471,28 +586,143 @@ with tabs[6]:
         * **Darker Colors:** Higher Median Views (Better performance).
         * **Lighter Colors:** Lower Median Views (Worse performance).
         * Use this to decide when to drop your next video!
+        * Medians are read from pre-built sketches, accurate to about 1%.
         """)
 
     if 'Video Release Date' in df.columns:
-        hm_df = df.copy()
-        hm_df['Video Release Date'] = pd.to_datetime(hm_df['Video Release Date'])
-        hm_df['Month'] = hm_df['Video Release Date'].dt.month_name()
-        hm_df['Day'] = hm_df['Video Release Date'].dt.day_name()
-        
-        month_order = ['January', 'February', 'March', 'April', 'May', 'June', 'July', 'August', 'September', 'October', 'November', 'December']
-        day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-        
-        heatmap_data = hm_df.groupby(['Month', 'Day'])['View Count'].median().reset_index()
-        
-        fig_heat = px.density_heatmap(
-            heatmap_data, 
-            x='Month', 
-            y='Day', 
-            z='View Count', 
-            title="Median Views by Release Time",
-            category_orders={'Month': month_order, 'Day': day_order},
-            color_continuous_scale='Viridis'
-        )
+        cube = timing_cube(history_key, df_groups)
+        views = ["Month × Weekday", "Weekday × Hour"] if cube.has_hours else ["Month × Weekday"]
+        h1, h2 = st.columns(2)
+        view = h1.radio("Break down by:", views, horizontal=True, **kept("timing_view", options=views))
+        drill_options = ["All shown artists"] + all_artists
+        drill = h2.selectbox("Drill down to artist:", options=drill_options, **kept("timing_drill", options=drill_options))
+        if drill == "All shown artists":
+            slots = cube.slots(selected_artists, excluded_artists)
+        else:
+            slots = cube.slots([drill])
+
+        def heatmap_figure():
+            x, y = ('Month', 'Day') if view == "Month × Weekday" else ('Hour', 'Day')
+            heatmap_data = cube.quantile(by=(x, y), slots=slots)
+            
+            return px.density_heatmap(
+                heatmap_data, 
+                x=x, 
+                y=y, 
+                z='View Count', 
+                title="Median Views by Release Time",
+                category_orders={'Month': MONTH_ORDER, 'Day': DAY_ORDER},
+                nbinsx=24 if x == 'Hour' else None,
+                color_continuous_scale='Viridis'
+            )
+
+        fig_heat = tab_memo(("heatmap", data_key, view, drill), heatmap_figure)
         st.plotly_chart(fig_heat, use_container_width=True)
+
+        if cube.has_hours:
+            by_hour = cube.quantile(by=('Hour',), slots=slots)
+            fig_hour = px.bar(by_hour, x='Hour', y='View Count', hover_data=['Videos'], title="Median Views by Release Hour")
+            st.plotly_chart(fig_hour, use_container_width=True)
     else:
-        st.warning("Missing 'Video Release Date'. Upload Detailed Analytics file.")
\ No newline at end of file
+        st.warning("Missing 'Video Release Date'. Upload Detailed Analytics file.")
+
+# === TAB 8: SENSITIVITY SWEEP ===
+def render_sensitivity():
+    st.header("🧭 Where does the deal flip?")
+    with st.expander("ℹ️ How does this work?"):
+        st.markdown("""
+        **The Logic:**
+        Instead of moving the sidebar sliders one value at a time, we evaluate every combination of RPM, Flat Fee and Production Cost in the ranges below at once.
+        
+        * **Wealth Gap:** Same formula as the Asset Gap tab, summed over all shown artists. The black line is the **break-even contour** where the gap is zero.
+        * **Artists Lost:** Share of artists whose own Wealth Gap is positive (they would have earned more independent).
+        * **Lottery:** Share of videos (over 10k views) that earned more than the Flat Fee. Production Cost does not affect it.
+        """)
+
+    g1, g2, g3 = st.columns(3)
+    rpm_range = g1.slider("RPM range", 0.5, 20.0, step=0.5, **kept("sweep_rpm_range", (0.5, 10.0)))
+    fee_range = g2.slider("Flat Fee range ($)", 0, 50000, step=500, **kept("sweep_fee_range", (0, 20000)))
+    cost_range = g3.slider("Production Cost range ($)", 0, 20000, step=500, **kept("sweep_cost_range", (0, 10000)))
+    steps = st.select_slider("Grid points per axis", options=[20, 40, 60, 80, 100], **kept("sweep_steps", 60))
+
+    base = artist_base(history_key, filter_key, df)
+    sweep = tab_memo(
+        ("sweep", data_key, rpm_range, fee_range, cost_range, steps),
+        lambda: sensitivity_sweep(
+            base, df['View Count'],
+            np.linspace(*rpm_range, steps), np.linspace(*fee_range, steps), np.linspace(*cost_range, steps),
+        ),
+    )
+    # Slice the precomputed grid at the chosen production cost; moving this slider recomputes nothing.
+    cost_index = int(np.abs(sweep.prod_cost - prod_cost).argmin())
+    slice_options = list(range(len(sweep.prod_cost)))
+    cost_slice = st.select_slider("Production Cost slice ($)", options=slice_options, **kept("sweep_cost_slice", cost_index, options=slice_options), format_func=lambda i: f"{sweep.prod_cost[i]:,.0f}")
+
+    def contour(z, title, colorbar, level=None):
+        fig = go.Figure(go.Contour(x=sweep.rpm, y=sweep.flat_fee, z=z.T, colorscale='RdYlGn_r', colorbar=dict(title=colorbar)))
+        if level is not None:
+            fig.add_trace(go.Contour(
+                x=sweep.rpm, y=sweep.flat_fee, z=z.T, showscale=False, hoverinfo='skip', name="Break-even",
+                contours=dict(start=level, end=level, size=1, coloring='none', showlabels=False), line=dict(color='black', width=3),
+            ))
+        fig.add_trace(go.Scatter(x=[rpm], y=[flat_fee], mode='markers', marker=dict(symbol='x', size=12, color='black'), name="Sidebar settings"))
+        fig.update_layout(title=title, xaxis_title="RPM ($ per 1k views)", yaxis_title="Flat Fee ($)", showlegend=False)
+        return fig
+
+    st.plotly_chart(contour(sweep.wealth_gap[:, :, cost_slice], f"Total Wealth Gap (Production Cost ${sweep.prod_cost[cost_slice]:,.0f})", "Wealth Gap ($)", level=0), use_container_width=True)
+
+    c1, c2 = st.columns(2)
+    n_artists = max(len(base), 1)
+    c1.plotly_chart(contour(sweep.artists_lost[:, :, cost_slice] / n_artists, "Artists Lost (black line: half of them)", "Share", level=0.5), use_container_width=True)
+    n_videos = sweep.videos_lost + sweep.videos_won
+    lost_share = np.divide(sweep.videos_lost, n_videos, out=np.zeros(sweep.videos_lost.shape), where=n_videos > 0)
+    c2.plotly_chart(contour(lost_share, "Lottery Videos Lost (black line: half of them)", "Share", level=0.5), use_container_width=True)
+
+    st.subheader("Break-even RPM per artist")
+    st.caption(f"Above this RPM the artist earns more independent than from a ${flat_fee:,} flat fee with ${prod_cost:,} production cost per video (sidebar settings).")
+    st.dataframe(
+        artist_break_even(base, flat_fee, prod_cost)[['Clean_Artist_Name', 'Video Title', 'View Count', 'Break_Even_RPM']],
+        hide_index=True, use_container_width=True,
+        column_config={'Video Title': "Videos", 'View Count': st.column_config.NumberColumn("Total Views", format="%d"), 'Break_Even_RPM': st.column_config.NumberColumn("Break-even RPM", format="$%.2f")},
+    )
+
+# --- RENDER TABS ---
+TABS = [
+    ("📊 The Asset Gap", "Asset Gap", render_asset_gap),
+    ("🎟️ The Lottery Ticket", "Lottery Ticket", render_lottery),
+    ("👻 Ghost Income", "Ghost Income", render_ghost_income),
+    ("🔮 Deal Simulator", "Deal Simulator", render_deal_simulator),
+    ("📈 Weekly Pitch", "Weekly Pitch", render_weekly_pitch),
+    ("📅 Monthly Salary", "Monthly Salary", render_monthly_salary),
+    ("🔥 Perfect Timing", "Perfect Timing", render_heatmap),
+    ("🧭 Sensitivity", "Sensitivity", render_sensitivity),
+]
+
+# Lazy mode reruns the script on tab switches and skips every closed tab.
+lazy_tabs = st.session_state.get("lazy_tabs", True)
+tab_labels = [label for label, _, _ in TABS]
+if lazy_tabs:
+    tabs = st.tabs(tab_labels, key="active_tab", on_change="rerun")
+else:
+    tabs = st.tabs(tab_labels)
+
+for tab, (_, name, render) in zip(tabs, TABS):
+    if lazy_tabs and not tab.open:
+        continue
+    with tab, timer.stage(f"tab: {name}"):
+        render()
+
+# --- DIAGNOSTICS ---
+st.sidebar.markdown("---")
+with st.sidebar.expander("🩺 Diagnostics"):
+    st.checkbox("Only compute the open tab", value=True, key="lazy_tabs", help=f"Skips the data prep and charts of tabs you are not looking at. Untick to render all {len(TABS)} tabs on every rerun.")
+    st.checkbox("Time each pipeline stage", key="profile_stages", help="Records wall time, row counts and memory change for every stage of the next reruns.")
+    log_stages = st.checkbox("Append timings to log file", value=False, help=f"Writes one JSON line per stage to '{PROFILE_LOG}'.")
+    if timer.records:
+        st.caption(f"Last rerun: {timer.total_seconds():.2f}s across {len(timer.records)} stages")
+        st.dataframe(
+            timer.to_frame().style.format({'seconds': '{:.3f}', 'rows': '{:,.0f}', 'rss_delta_mb': '{:+.1f}', 'rss_mb': '{:.0f}'}, na_rep='-'),
+            hide_index=True, use_container_width=True
+        )
+        if log_stages:
+            timer.write_jsonl(upload_key=upload_key)
@@ -1,77 +1,262 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
-import time
+"""Keep the deployed dashboards warm with plain HTTP requests.
+
+Every target URL is probed concurrently on one asyncio loop. Each calls its
+app's ``/warmup`` endpoint (see ``app.py``), which answers once the default
+dataset is cached, and retries with exponential backoff while the app is
+booting; a slow or dead target never delays the others. Deployments that
+still run ``dashboard.py`` directly have no ``/warmup`` route; for those the
+built-in ``/_stcore/health`` probe is used, and only its ``ok`` body counts
+as ready.
+
+A Streamlit Community Cloud app that has gone to sleep answers every path
+with its "Yes, get this app back up!" page, which needs a browser click.
+When that page shows up and Selenium is installed (``pip install selenium``,
+the only optional dependency), the button is clicked once in headless Chrome
+and the HTTP probes then wait for the app to boot. Without Selenium the
+target fails at once.
+
+    python main.py https://app-eu.example https://app-us.example --deadline 120
+
+Targets default to ``STREAMLIT_APP_URLS`` (whitespace or comma separated) or
+``STREAMLIT_APP_URL``. One JSON result per target is printed at the end; the
+exit status is non-zero if any target is not ready before its deadline.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
 import os
+import random
+import re
+import ssl
+import sys
+import time
+from urllib.parse import urljoin, urlsplit
+
+try:
+    # Optional: only needed to click a hibernated Community Cloud app awake.
+    from selenium import webdriver
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+except ImportError:
+    webdriver = None
 
 # Streamlit app URL
 STREAMLIT_URL = os.environ.get("STREAMLIT_APP_URL", "https://music-money-analytics-6w38qnsrdok58yvctt3x5a.streamlit.app/")
+STREAMLIT_URLS = os.environ.get("STREAMLIT_APP_URLS", "")
 
-def main():
-    print("----------------------------------------------------------------")
-    print("Starting Strict Wake-Up Script (Long Wait Version)")
-    print("----------------------------------------------------------------")
+# Give up on a target after this many seconds in total.
+WAKE_DEADLINE = float(os.environ.get("MMA_WAKE_DEADLINE", 120))
+REQUEST_TIMEOUT = 30
+BACKOFF_START = 1.0
+BACKOFF_MAX = 20.0
+MAX_REDIRECTS = 3
 
-    options = Options()
-    options.add_argument('--headless=new')
-    options.add_argument('--no-sandbox')
-    options.add_argument('--disable-dev-shm-usage')
-    options.add_argument('--window-size=1920,1080')
-    options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/110.0.0.0 Safari/537.36")
+WARMUP_PATH = "warmup"
+HEALTH_PATH = "_stcore/health"
+USER_AGENT = "music-money-wake/2.0"
+# Phrases from Streamlit Community Cloud's sleeping-app page.
+HIBERNATION_MARKERS = ("get this app back up", "gone to sleep")
+WAKE_BUTTON_XPATH = "//button[contains(., 'Yes, get this app back up')]"
+BROWSER_TIMEOUT = 30
 
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
 
-    try:
-        driver.get(STREAMLIT_URL)
-        print(f"Page loaded: {driver.title}")
-        time.sleep(5) 
+def is_hibernating(body):
+    """Whether ``body`` is the page of a sleeping Community Cloud app."""
+    text = body.lower()
+    return any(marker in text for marker in HIBERNATION_MARKERS)
 
-        # --- STEP 1: WAKE UP THE APP ---
+
+def click_wake_button(url, timeout=BROWSER_TIMEOUT):
+    """Open ``url`` in headless Chrome and click the sleeping app's wake button.
+
+    Returns whether the button was found. Needs Selenium; blocking, so run it
+    in a thread.
+    """
+    options = webdriver.ChromeOptions()
+    for arg in ("--headless=new", "--no-sandbox", "--disable-dev-shm-usage", "--window-size=1920,1080"):
+        options.add_argument(arg)
+    driver = webdriver.Chrome(options=options)
+    try:
+        driver.get(url)
         try:
-            wake_btn = WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.XPATH, "//button[contains(., 'Yes, get this app back up')]"))
-            )
-            print("⚠️ SLEEPING STATUS DETECTED: 'Wake Up' button found.")
-            driver.execute_script("arguments[0].click();", wake_btn)
-            print("ACTION: Clicked the button using JavaScript.")
-            
-        except:
-            print("INFO: 'Wake Up' button not found. App might already be loading or awake.")
-
-        # --- STEP 2: WAIT FOR CONTENT (POLLING) ---
-        # Wait up to 90 seconds (18 checks * 5 seconds) for the app to load
-        print("Waiting for app to finish booting up (this can take ~60 seconds)...")
-        
-        max_retries = 18
-        success = False
-        
-        for i in range(max_retries):
-            page_source = driver.page_source
-            
-            # Check for specific keywords from your user table
-            if "Channel Name" in page_source or "Video Name" in page_source or "Music Money" in page_source:
-                print(f"✅ SUCCESS: App content detected on attempt #{i+1}!")
-                success = True
-                break
-            
-            print(f"Attempt {i+1}/{max_retries}: Content not ready yet. Waiting 5s...")
-            time.sleep(5)
-
-        if not success:
-            print("❌ FAILURE: Timed out waiting for app content to load.")
-            # Optional: Print page title to see if it's stuck on 'Streamlit' or an error
-            print(f"Final Page Title: {driver.title}") 
-            exit(1) # Fail the Action
-
-    except Exception as e:
-        print(f"❌ CRITICAL ERROR: {e}")
-        exit(1)
+            button = WebDriverWait(driver, timeout).until(EC.presence_of_element_located((By.XPATH, WAKE_BUTTON_XPATH)))
+        except Exception:
+            return False
+        driver.execute_script("arguments[0].click();", button)
+        return True
     finally:
         driver.quit()
 
+
+async def _read_body(reader, headers):
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        body = b""
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            if size == 0:
+                return body
+            body += await reader.readexactly(size)
+            await reader.readline()
+    if "content-length" in headers:
+        return await reader.readexactly(int(headers["content-length"]))
+    return await reader.read()
+
+
+async def _exchange(parts):
+    secure = parts.scheme == "https"
+    reader, writer = await asyncio.open_connection(
+        parts.hostname, parts.port or (443 if secure else 80),
+        ssl=ssl.create_default_context() if secure else None,
+    )
+    try:
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        writer.write(
+            f"GET {path} HTTP/1.1\r\nHost: {parts.netloc}\r\nUser-Agent: {USER_AGENT}\r\n"
+            f"Accept: application/json, */*\r\nConnection: close\r\n\r\n".encode("latin-1")
+        )
+        await writer.drain()
+        status = int((await reader.readline()).split()[1])
+        headers = {}
+        while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        return status, headers, await _read_body(reader, headers)
+    finally:
+        writer.close()
+
+
+async def fetch(url, timeout=REQUEST_TIMEOUT):
+    """GET ``url`` and return ``(status, body)``, following a few redirects.
+
+    Raises ``OSError`` or ``asyncio.TimeoutError`` when the target cannot be reached.
+    """
+    for _ in range(MAX_REDIRECTS + 1):
+        status, headers, body = await asyncio.wait_for(_exchange(urlsplit(url)), timeout)
+        if status not in (301, 302, 303, 307, 308) or "location" not in headers:
+            break
+        url = urljoin(url, headers["location"])
+    return status, body.decode("utf-8", "replace")
+
+
+def backoff_delays(start=BACKOFF_START, limit=BACKOFF_MAX):
+    """Exponential delays with full jitter: ~1s, 2s, 4s, ... capped at ``limit``."""
+    delay = start
+    while True:
+        yield random.uniform(delay / 2, delay)
+        delay = min(delay * 2, limit)
+
+
+async def wake(base_url, deadline=WAKE_DEADLINE, timeout=REQUEST_TIMEOUT, log=print):
+    """Probe ``base_url`` until it reports ready or ``deadline`` seconds pass.
+
+    Returns a result dict with ``url``, ``ready``, ``attempts``, ``endpoint``,
+    the last probe's ``status`` and ``latency``, ``time_to_ready`` (``None``
+    when not ready), ``clicked`` (whether a hibernated app's wake button was
+    pressed) and, from ``/warmup``, the app's own summary as ``app``.
+    """
+    base_url = base_url.rstrip("/") + "/"
+    path = WARMUP_PATH
+    started = time.monotonic()
+    delays = backoff_delays()
+    result = {"url": base_url, "ready": False, "attempts": 0, "endpoint": path,
+              "status": None, "latency": None, "time_to_ready": None, "clicked": False}
+
+    for attempt in itertools.count(1):
+        remaining = deadline - (time.monotonic() - started)
+        sent = time.monotonic()
+        try:
+            status, body = await fetch(base_url + path, min(timeout, max(remaining, 0.1)))
+            error = None
+        except (OSError, asyncio.TimeoutError, ValueError, IndexError, asyncio.IncompleteReadError) as e:
+            status, body, error = None, "", str(e) or type(e).__name__
+        result.update(attempts=attempt, endpoint=path, status=status, latency=round(time.monotonic() - sent, 3))
+
+        hibernating = is_hibernating(body)
+        if hibernating and not result["clicked"]:
+            if webdriver is None:
+                result["error"] = "app is hibernating; install selenium so the 'get this app back up' button can be clicked"
+                log(f"ERROR: {base_url} {result['error']}.")
+                return result
+            log(f"⚠️ {base_url} is hibernating. Clicking 'Yes, get this app back up' in headless Chrome...")
+            try:
+                result["clicked"] = await asyncio.to_thread(click_wake_button, base_url)
+            except Exception as e:
+                result["error"] = f"browser wake failed: {e}"
+                log(f"ERROR: {base_url} {result['error']}")
+                return result
+            if not result["clicked"]:
+                result["error"] = "app is hibernating but the wake button was not found"
+                log(f"ERROR: {base_url} {result['error']}.")
+                return result
+
+        report = None
+        if hibernating:
+            error = "still waking up after the button click"
+        elif path == WARMUP_PATH and status in (200, 404):
+            try:
+                report = json.loads(body)
+            except ValueError:
+                # Plain `streamlit run dashboard.py` answers unknown paths with its HTML shell.
+                log(f"INFO: {base_url} has no /warmup route (runs dashboard.py directly). Falling back to the health probe.")
+                path = HEALTH_PATH
+                continue
+        if hibernating:
+            ready = False
+        elif path == WARMUP_PATH:
+            ready = status == 200 and isinstance(report, dict) and report.get("status") == "ready"
+        else:
+            ready = status == 200 and body.strip() == "ok"
+        if ready:
+            result.update(ready=True, time_to_ready=round(time.monotonic() - started, 3))
+            if report:
+                result["app"] = report
+            return result
+        if status == 200 and error is None:
+            error = f"HTTP 200 with unexpected body {body[:60]!r}"
+
+        remaining = deadline - (time.monotonic() - started)
+        if remaining <= 0:
+            result["error"] = error or f"HTTP {status}"
+            return result
+        delay = min(next(delays), remaining)
+        log(f"{base_url} attempt {attempt}: {error or f'HTTP {status}'}. Retrying in {delay:.1f}s...")
+        await asyncio.sleep(delay)
+
+
+async def wake_all(urls, deadline=WAKE_DEADLINE, timeout=REQUEST_TIMEOUT, log=print):
+    """Run :func:`wake` for every URL concurrently; results come back in ``urls`` order."""
+    return await asyncio.gather(*(wake(url, deadline, timeout, log) for url in urls))
+
+
+def parse_args(argv=None):
+    default_urls = [u for u in re.split(r"[\s,]+", STREAMLIT_URLS) if u] or [STREAMLIT_URL]
+    parser = argparse.ArgumentParser(description="Wake and health-check dashboard deployments.")
+    parser.add_argument("urls", nargs="*", default=default_urls, help="App URLs (default: STREAMLIT_APP_URLS or STREAMLIT_APP_URL).")
+    parser.add_argument("--deadline", type=float, default=WAKE_DEADLINE, help="Seconds to wait for each target.")
+    parser.add_argument("--request-timeout", type=float, default=REQUEST_TIMEOUT, help="Seconds before a single probe is abandoned.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    print("----------------------------------------------------------------")
+    print(f"Waking {len(args.urls)} app(s)")
+    print("----------------------------------------------------------------")
+
+    results = asyncio.run(wake_all(args.urls, args.deadline, args.request_timeout))
+    for r in results:
+        if r["ready"]:
+            print(f"✅ {r['url']} ready after {r['time_to_ready']:.1f}s ({r['attempts']} attempt(s), last probe {r['latency']:.2f}s)")
+        else:
+            print(f"❌ {r['url']} not ready after {args.deadline:.0f}s ({r['error']})")
+    json.dump(results, sys.stdout, indent=2)
+    print()
+    if not all(r["ready"] for r in results):
+        raise SystemExit(1)
+
+
 if __name__ == "__main__":
     main()
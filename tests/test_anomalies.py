@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+
+from analytics.anomalies import AnomalyDetector
+
+
+def _feed(detector, weekly_gains):
+    keys = pd.Index(['steady', 'collapsed', 'stalled', 'deleted'])
+    labels = None
+    for gains in weekly_gains:
+        labels = detector.update(pd.Series(gains, index=keys, dtype='float64'), days=7)
+    return labels
+
+
+def test_collapsed_and_stalled_gains_are_drops():
+    rng = np.random.default_rng(0)
+    history = [np.full(4, 700.0) * rng.uniform(0.8, 1.2, 4) for _ in range(6)]
+    labels = _feed(AnomalyDetector(), history + [[710.0, 7.0, 0.0, -50.0]])
+
+    assert labels.isna()['steady']
+    assert labels['collapsed'] == 'drop'
+    assert labels['stalled'] == 'drop'
+    assert labels['deleted'] == 'negative'
+
+
+def test_spike_is_flagged_and_not_learned():
+    detector = AnomalyDetector()
+    history = [[700.0, 700.0, 700.0, 700.0], [650.0, 650.0, 650.0, 650.0], [720.0] * 4, [690.0] * 4]
+    assert _feed(detector, history + [[7000.0, 700.0, 700.0, 700.0]])['steady'] == 'spike'
+    assert _feed(detector, [[700.0] * 4]).isna().all()
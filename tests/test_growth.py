@@ -0,0 +1,23 @@
+from analytics.filters import ExclusionFilter
+from analytics.growth import GrowthIndex
+from analytics.ingest import attach_artists, build_artist_map, read_history
+from benchmarks.synthetic import make_analytics, make_history, to_csv_bytes
+
+
+def _history(n_videos, n_snapshots, n_artists):
+    history = read_history(to_csv_bytes(make_history(n_videos, n_snapshots, n_artists=n_artists)), ExclusionFilter())
+    return attach_artists(history, build_artist_map(make_analytics(n_videos, n_artists=n_artists)))
+
+
+def test_velocity_with_more_than_127_artists():
+    # Past 127 categories the artist codes widen from int8 to int16.
+    history = _history(2000, 4, n_artists=500)
+    assert history['Clean_Artist_Name'].nunique() > 127
+
+    velocity = GrowthIndex.from_history(history).artist_velocity()
+
+    latest = velocity[velocity['Date_Scraped'] == velocity['Date_Scraped'].max()]
+    expected = history[history['Date_Scraped'] == history['Date_Scraped'].max()].groupby('Clean_Artist_Name', observed=True)['View Count'].sum()
+    assert len(latest) == len(expected) > 127
+    assert latest.set_index('Clean_Artist_Name')['View Count'].sort_index().tolist() == expected.astype('float64').sort_index().tolist()
+    assert latest['Flagged_Views'].notna().all()
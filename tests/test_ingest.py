@@ -0,0 +1,39 @@
+import pytest
+
+from analytics.ingest import load_datasets
+
+WITH_ID = b"""Date_Scraped,Video_ID,Video_Title,View_Count,Channel_Name
+2026-01-01,a1,Song A,100,Chan 1
+2026-01-01,b1,Song B,200,Chan 2
+2026-01-08,a1,Song A,150,Chan 1
+"""
+
+# No Video_ID and no Channel_Name; repeats Song A on a date the other log has.
+WITHOUT_ID = b"""Date_Scraped,Video_Title,View_Count
+2026-01-01,Song A,100
+2026-01-08,Song C,300
+2026-01-08,Song D,400
+"""
+
+
+@pytest.mark.parametrize('files', [
+    [('with_id.csv', WITH_ID), ('without_id.csv', WITHOUT_ID)],
+    [('without_id.csv', WITHOUT_ID), ('with_id.csv', WITH_ID)],
+])
+def test_merge_logs_with_different_columns(files):
+    df_history, _, _, stats = load_datasets(files)
+
+    assert len(df_history) == 6
+    assert {'Video_ID', 'Channel Name'} <= set(df_history.columns)
+    assert sorted(df_history['Video_ID'].dropna()) == ['a1', 'a1', 'b1']
+    assert df_history['Channel Name'].isna().sum() == 3
+    assert sum(s['duplicates'] for s in stats.values()) == 0
+
+
+def test_malformed_view_counts_are_blank_not_fatal():
+    log = b'Date_Scraped,Video_ID,Video_Title,View_Count\n2026-01-01,a,A,"1,234"\n2026-01-01,b,B,abc\n2026-01-01,c,C,\n'
+    df_history, _, _, stats = load_datasets([('log.csv', log)])
+
+    assert df_history['View Count'].tolist()[0] == 1234
+    assert df_history['View Count'].isna().sum() == 2
+    assert stats['log.csv']['bad_views'] == 1
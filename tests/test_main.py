@@ -0,0 +1,99 @@
+import asyncio
+import itertools
+import json
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import main
+
+READY = {'status': 'ready', 'rows': 5}
+SHELL = '<html><body>Streamlit</body></html>'
+
+
+@pytest.fixture
+def serve():
+    """Start a stub app whose ``respond(path)`` returns ``(status, body)``; yields its URL."""
+    servers = []
+
+    def start(respond):
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                status, body = respond(self.path)
+                payload = body.encode()
+                self.send_response(status)
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_address[1]}/"
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture(autouse=True)
+def fast_backoff(monkeypatch):
+    monkeypatch.setattr(main, 'backoff_delays', lambda: itertools.repeat(0.01))
+
+
+def _refused_url():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}/"
+
+
+def _wake_all(urls, deadline=5):
+    return asyncio.run(main.wake_all(urls, deadline=deadline, timeout=2, log=lambda message: None))
+
+
+def test_ready_warmup(serve):
+    url = serve(lambda path: (200, json.dumps(READY)) if path == '/warmup' else (404, ''))
+
+    [result] = _wake_all([url])
+
+    assert result['ready'] and result['attempts'] == 1
+    assert result['endpoint'] == 'warmup' and result['status'] == 200
+    assert result['app'] == READY and not result['clicked']
+
+
+def test_503_then_ready(serve):
+    calls = itertools.count(1)
+    url = serve(lambda path: (200, json.dumps(READY)) if next(calls) > 2 else (503, 'booting'))
+
+    [result] = _wake_all([url])
+
+    assert result['ready'] and result['attempts'] == 3
+    assert result['status'] == 200 and result['app'] == READY
+
+
+def test_html_shell_falls_back_to_health(serve):
+    url = serve(lambda path: (200, 'ok') if path == '/_stcore/health' else (200, SHELL))
+
+    [result] = _wake_all([url])
+
+    assert result['ready'] and result['endpoint'] == '_stcore/health'
+    assert result['attempts'] == 2 and 'app' not in result
+
+
+def test_refused_target_fails_without_delaying_others(serve):
+    ready = serve(lambda path: (200, json.dumps(READY)))
+    refused = _refused_url()
+
+    results = _wake_all([refused, ready], deadline=0.5)
+
+    assert [r['url'] for r in results] == [refused, ready]
+    assert not results[0]['ready'] and results[0]['status'] is None
+    assert results[0]['error'] and results[0]['time_to_ready'] is None
+    assert results[1]['ready'] and results[1]['attempts'] == 1